@@ -3,13 +3,27 @@ IBKR Tax Tool
 A tool for fetching and processing IBKR trading data for Chinese tax filing
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "IBKR Tax Tool Contributors"
 
-from .api.flex_query import FlexQueryClient
-from .services.exchange_rate import ExchangeRateService
-
 __all__ = [
     "FlexQueryClient",
     "ExchangeRateService",
 ]
+
+# Public names and the modules that define them, imported on first access so that
+# `ibkr-toolkit --help` does not pay for requests/xmltodict
+_LAZY_EXPORTS = {
+    "FlexQueryClient": ".api.flex_query",
+    "ExchangeRateService": ".services.exchange_rate",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -184,8 +184,9 @@ class FlexQueryClient:
             APIError: If any step fails
         """
         reference_code = self.request_report(from_date=from_date, to_date=to_date)
-        time.sleep(2)  # Wait for report generation
-        data = self.get_report(reference_code)
+        # get_report polls until the statement is ready instead of waiting upfront; the
+        # extra attempt replaces that wait so slow reports get as much time as before
+        data = self.get_report(reference_code, max_retries=MAX_RETRIES + 1)
         return data
 
     def save_raw_data(self, data: Union[Dict[str, Any], list], filepath: str) -> None:
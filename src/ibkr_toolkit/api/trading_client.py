@@ -5,8 +5,30 @@ This module provides a client for interacting with IBKR's Web API for trading op
 Replaces the previous ib_async implementation.
 """
 
-from typing import Any, Dict, List, Optional
-
+import asyncio
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import isnan
+from operator import countOf, itemgetter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..constants import (
+    CONID_CACHE_DAYS,
+    CONID_ORDER_MAX_AGE,
+    MARKET_DATA_MAX_SUBSCRIPTIONS,
+    MARKET_DATA_POLL_INTERVAL,
+    MARKET_DATA_TIMEOUT,
+    ORDER_INDEX_TTL,
+    PERFORMANCE_CACHE_TTL,
+    POSITIONS_CACHE_TTL,
+    PRICE_CACHE_TTL,
+    WEB_API_MAX_WORKERS,
+)
 from ..utils.logging import setup_logger
 from .web_client import WebAPIClient, WebAPIError
 
@@ -22,6 +44,10 @@ class TradingClient:
     - Market data queries
     - Order placement and management
     - Account queries
+
+    Methods are blocking. Code running inside an event loop should use the
+    *_async variants and ``async with TradingClient() as client:``, e.g.
+    ``await asyncio.gather(*(client.get_market_price_async(s) for s in symbols))``.
     """
 
     def __init__(
@@ -29,6 +55,10 @@ class TradingClient:
         base_url: str = "https://localhost:5001/v1/api",
         verify_ssl: bool = False,
         timeout: int = 30,
+        price_ttl: float = PRICE_CACHE_TTL,
+        conid_cache_file: Optional[str] = None,
+        market_data_timeout: float = MARKET_DATA_TIMEOUT,
+        poll_interval: float = MARKET_DATA_POLL_INTERVAL,
     ):
         """
         Initialize trading client
@@ -37,9 +67,38 @@ class TradingClient:
             base_url: IBKR Web API base URL
             verify_ssl: Whether to verify SSL certificates
             timeout: Request timeout in seconds
+            price_ttl: Seconds a fetched market price is reused (0 disables caching)
+            conid_cache_file: Optional JSON file persisting resolved contract IDs
+                              across runs (entries expire after CONID_CACHE_DAYS;
+                              orders search again after CONID_ORDER_MAX_AGE)
+            market_data_timeout: Maximum seconds to wait for snapshot prices
+            poll_interval: Seconds between snapshot polls while waiting for prices
         """
         self.client = WebAPIClient(base_url=base_url, verify_ssl=verify_ssl, timeout=timeout)
         self._connected = False
+        self.price_ttl = price_ttl
+        self.market_data_timeout = market_data_timeout
+        self.poll_interval = poll_interval
+        # symbol -> (price, monotonic timestamp)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        # symbol -> (contract ID, resolve time as epoch seconds)
+        self.conid_cache_file = conid_cache_file
+        self._conids: Dict[str, Tuple[int, float]] = self._load_conid_cache()
+        self._conid_cache_lock = threading.Lock()
+        # Set when contract IDs were resolved since the cache file was last written
+        self._conids_dirty = False
+        # In-flight lookups shared by concurrent callers, keyed by (operation, argument)
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Contracts with an open market data stream, least recently used first
+        self._subscriptions: OrderedDict[int, None] = OrderedDict()
+        self._subscriptions_lock = threading.Lock()
+        # account -> (monotonic timestamp, formatted positions)
+        self._positions_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # (sorted account IDs, period) -> (monotonic timestamp, performance data)
+        self._performance_cache: Dict[Tuple[Tuple[str, ...], str], Tuple[float, Dict]] = {}
+        # (monotonic timestamp, orderId -> open order) for all accounts
+        self._order_index: Optional[Tuple[float, Dict[int, Dict[str, Any]]]] = None
         logger.info("Trading client initialized")
 
     def connect(self) -> bool:
@@ -71,8 +130,11 @@ class TradingClient:
         """
         Disconnect from IBKR Web API
 
-        Note: Web API doesn't require explicit disconnect
+        Note: Web API doesn't require explicit disconnect, but open market data
+        streams are released so they do not hold market data lines.
         """
+        self.close_subscriptions()
+        self.client.close()
         self._connected = False
         logger.info("Disconnected from IBKR Web API")
 
@@ -89,6 +151,9 @@ class TradingClient:
         """
         Get account positions
 
+        Positions are reused for POSITIONS_CACHE_TTL seconds and dropped whenever an
+        order is placed or cancelled through this client.
+
         Args:
             account: Account ID
 
@@ -105,31 +170,64 @@ class TradingClient:
         Raises:
             WebAPIError: If request fails
         """
+        cached = self._positions_cache.get(account)
+        if cached and time.monotonic() - cached[0] < POSITIONS_CACHE_TTL:
+            return list(cached[1])
+
         try:
             positions = self.client.get_positions(account)
 
             # Format positions to match expected interface
-            formatted_positions = []
-            for pos in positions:
-                formatted_positions.append(
-                    {
-                        "symbol": pos.get("contractDesc", ""),
-                        "position": pos.get("position", 0),
-                        "avgCost": pos.get("avgCost", 0),
-                        "mktPrice": pos.get("mktPrice", 0),
-                        "mktValue": pos.get("mktValue", 0),
-                        "unrealizedPnl": pos.get("unrealizedPnl", 0),
-                        "conid": pos.get("conid", 0),
-                    }
-                )
+            formatted_positions = [
+                {
+                    "symbol": pos.get("contractDesc", ""),
+                    "position": self._safe_number(pos.get("position")),
+                    "avgCost": self._safe_number(pos.get("avgCost")),
+                    "mktPrice": self._safe_number(pos.get("mktPrice")),
+                    "mktValue": self._safe_number(pos.get("mktValue")),
+                    "unrealizedPnl": self._safe_number(pos.get("unrealizedPnl")),
+                    "conid": pos.get("conid", 0),
+                }
+                for pos in positions
+            ]
 
+            self._positions_cache[account] = (time.monotonic(), formatted_positions)
             logger.info(f"Retrieved {len(formatted_positions)} positions for account {account}")
-            return formatted_positions
+            return list(formatted_positions)
 
         except WebAPIError as e:
             logger.error(f"Failed to get positions: {e}")
             raise
 
+    @staticmethod
+    def _safe_number(value: Any) -> float:
+        """
+        Convert a numeric position field to float
+
+        Args:
+            value: Raw field value (may be missing, null or NaN)
+
+        Returns:
+            Value as float, or 0.0 if missing or not a number
+        """
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+        return 0.0 if isnan(number) else number
+
+    def invalidate_positions(self, account: Optional[str] = None):
+        """
+        Drop cached positions
+
+        Args:
+            account: Account to invalidate (if None, clear all cached positions)
+        """
+        if account is None:
+            self._positions_cache.clear()
+        else:
+            self._positions_cache.pop(account, None)
+
     def get_market_price(self, symbol: str) -> Optional[float]:
         """
         Get current market price for a symbol
@@ -143,34 +241,342 @@ class TradingClient:
         Raises:
             WebAPIError: If request fails
         """
+        cached = self._get_cached_price(symbol)
+        if cached is not None:
+            return cached
+
+        return self._coalesce(("price", symbol), self._fetch_market_price, symbol)
+
+    def _fetch_market_price(self, symbol: str) -> Optional[float]:
+        """Fetch market price for a symbol through the batched snapshot path"""
+        price = self.get_market_prices([symbol])[symbol]
+        if price is not None:
+            logger.info(f"Market price for {symbol}: ${price:.2f}")
+        return price
+
+    def get_market_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get current market prices for multiple symbols
+
+        Contract searches run concurrently and all prices are read from a single
+        market data snapshot request.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dictionary mapping each symbol to its market price (None if not available)
+
+        Raises:
+            WebAPIError: If request fails
+        """
+        prices: Dict[str, Optional[float]] = dict.fromkeys(symbols)
+
+        # Serve recently fetched prices from cache
+        missing = []
+        for symbol in prices:
+            prices[symbol] = self._get_cached_price(symbol)
+            if prices[symbol] is None:
+                missing.append(symbol)
+
+        if not missing:
+            return prices
+
         try:
-            # First search for the contract
-            results = self.client.search_contract(symbol)
-            if not results:
-                logger.warning(f"No contract found for symbol {symbol}")
-                return None
-
-            # Use the first result (usually the primary exchange)
-            conid = results[0].get("conid")
-
-            # Get market snapshot
-            snapshot = self.client.get_market_snapshot([conid])
-            if not snapshot:
-                logger.warning(f"No market data available for {symbol}")
-                return None
-
-            # Extract last price (field 31)
-            price = snapshot[0].get("31")
-            if price:
-                logger.info(f"Market price for {symbol}: ${price:.2f}")
-                return float(price)
+            conids = self._resolve_conids(missing)
+
+            # Several symbols (aliases) may resolve to the same contract
+            symbols_by_conid: Dict[int, List[str]] = defaultdict(list)
+            for symbol, conid in zip(missing, conids):
+                if conid:
+                    symbols_by_conid[conid].append(symbol)
+                else:
+                    logger.warning(f"No contract found for symbol {symbol}")
+
+            if not symbols_by_conid:
+                return prices
+
+            # Get market snapshot for all contracts at once
+            snapshot = self._get_snapshot(list(symbols_by_conid))
+            for item in snapshot:
+                price = self._parse_price(item.get("31"))  # Last price
+                if price is None:
+                    continue
+                for symbol in symbols_by_conid.get(int(item.get("conid", 0)), ()):
+                    prices[symbol] = price
+                    self._cache_price(symbol, price)
 
-            return None
+            logger.info(
+                f"Retrieved market prices for "
+                f"{len(prices) - countOf(prices.values(), None)}/{len(prices)} symbols"
+            )
+            return prices
 
         except WebAPIError as e:
-            logger.error(f"Failed to get market price for {symbol}: {e}")
+            logger.error(f"Failed to get market prices: {e}")
             raise
 
+    def _coalesce(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func once for concurrent callers requesting the same key
+
+        The first caller performs the work; callers arriving while it is in flight
+        wait for and share its result (or exception).
+
+        Args:
+            key: Identifies the operation and its arguments
+            func: Function performing the work
+            *args: Arguments passed to func
+
+        Returns:
+            Result of func
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = func(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    @staticmethod
+    def _parse_price(value: Any) -> Optional[float]:
+        """
+        Parse a price field from a market data snapshot
+
+        Args:
+            value: Raw field value; may carry a "C" (prior close) or "H" (halted) prefix
+
+        Returns:
+            Price as float, or None if missing or not a number
+        """
+        if not value:
+            return None
+        if isinstance(value, str):
+            value = value.lstrip("CH")
+        try:
+            price = float(value)
+        except ValueError:
+            return None
+        return None if isnan(price) else price
+
+    def invalidate_cache(self, symbol: Optional[str] = None):
+        """
+        Drop cached market prices
+
+        Args:
+            symbol: Symbol to invalidate (if None, clear all cached prices)
+        """
+        if symbol is None:
+            self._price_cache.clear()
+        else:
+            self._price_cache.pop(symbol, None)
+
+    def _get_cached_price(self, symbol: str) -> Optional[float]:
+        """Return cached price for symbol if it is still fresh"""
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() - cached[1] < self.price_ttl:
+            return cached[0]
+        return None
+
+    def _cache_price(self, symbol: str, price: float):
+        """Store a freshly fetched price"""
+        if self.price_ttl > 0:
+            self._price_cache[symbol] = (price, time.monotonic())
+
+    def _get_snapshot(self, conids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get market data snapshot, polling until last prices arrive
+
+        The first snapshot request for a contract only starts its data stream and
+        often returns no fields, so the request is repeated every poll_interval
+        seconds until every contract has a last price or market_data_timeout expires.
+
+        Args:
+            conids: List of contract IDs
+
+        Returns:
+            List of market data snapshots
+        """
+        snapshot = self.client.get_market_snapshot(
+            conids,
+            wait=True,
+            timeout=self.market_data_timeout,
+            poll_interval=self.poll_interval,
+        )
+        self._track_subscriptions(conids)
+        return snapshot or []
+
+    def _track_subscriptions(self, conids: List[int]):
+        """
+        Record contracts whose market data stream was opened by a snapshot
+
+        Streams stay open on the gateway, so repeated snapshots of the same contracts
+        return prices immediately. The least recently used streams beyond
+        MARKET_DATA_MAX_SUBSCRIPTIONS are unsubscribed to free market data lines.
+
+        Args:
+            conids: Contract IDs included in the snapshot request
+        """
+        with self._subscriptions_lock:
+            for conid in conids:
+                self._subscriptions[conid] = None
+                self._subscriptions.move_to_end(conid)
+            evicted = []
+            while len(self._subscriptions) > MARKET_DATA_MAX_SUBSCRIPTIONS:
+                evicted.append(self._subscriptions.popitem(last=False)[0])
+
+        for conid in evicted:
+            try:
+                self.client.unsubscribe_market_data(conid)
+            except WebAPIError as e:
+                logger.warning(f"Failed to unsubscribe market data for {conid}: {e}")
+
+    def close_subscriptions(self):
+        """Unsubscribe all market data streams opened by this client"""
+        with self._subscriptions_lock:
+            if not self._subscriptions:
+                return
+            self._subscriptions.clear()
+
+        try:
+            self.client.unsubscribe_all_market_data()
+        except WebAPIError as e:
+            logger.warning(f"Failed to unsubscribe market data: {e}")
+
+    def _resolve_conids(
+        self, symbols: List[str], max_age: Optional[float] = None
+    ) -> List[Optional[int]]:
+        """
+        Resolve several stock symbols to contract IDs concurrently
+
+        Args:
+            symbols: Stock symbols
+            max_age: Search again for cached contract IDs older than this many seconds
+                     (None trusts any unexpired cache entry)
+
+        Returns:
+            Contract IDs in the same order as symbols (None where not found)
+        """
+        conids = self._map_concurrently(lambda symbol: self._lookup_conid(symbol, max_age), symbols)
+        # Write the cache file once for the whole batch
+        self._flush_conid_cache()
+        return conids
+
+    @staticmethod
+    def _map_concurrently(func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Apply func to each item using a pool of worker threads
+
+        Args:
+            func: Function taking a single item
+            items: Items to process
+
+        Returns:
+            Results in the same order as items
+        """
+        # A single item (the common per-order case) is not worth starting a pool for
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(WEB_API_MAX_WORKERS, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    def _resolve_conid(self, symbol: str, max_age: Optional[float] = None) -> Optional[int]:
+        """
+        Resolve a stock symbol to its contract ID
+
+        Resolved contract IDs are cached for the lifetime of the client and, if a
+        conid cache file is configured, persisted for later runs.
+
+        Args:
+            symbol: Stock symbol
+            max_age: Search again if the cached contract ID is older than this many
+                     seconds (None trusts any unexpired cache entry)
+
+        Returns:
+            Contract ID of the first search result, or None if not found
+        """
+        conid = self._lookup_conid(symbol, max_age)
+        self._flush_conid_cache()
+        return conid
+
+    def _lookup_conid(self, symbol: str, max_age: Optional[float] = None) -> Optional[int]:
+        """Resolve a symbol from the in-memory cache or a search, without writing the cache file"""
+        cached = self._conids.get(symbol)
+        if cached and (max_age is None or time.time() - cached[1] < max_age):
+            return cached[0]
+
+        return self._coalesce(("conid", symbol), self._search_conid, symbol)
+
+    def _search_conid(self, symbol: str) -> Optional[int]:
+        """Search for a symbol's contract ID and cache the result in memory"""
+        results = self.client.search_contract(symbol)
+        if not results:
+            return None
+        # Use the first result (usually the primary exchange)
+        conid = results[0].get("conid")
+        if not conid:
+            return None
+        self._conids[symbol] = (int(conid), time.time())
+        self._conids_dirty = True
+        return int(conid)
+
+    def _load_conid_cache(self) -> Dict[str, Tuple[int, float]]:
+        """Load unexpired contract IDs from the conid cache file"""
+        if not self.conid_cache_file or not os.path.exists(self.conid_cache_file):
+            return {}
+        cutoff = time.time() - CONID_CACHE_DAYS * 86400
+        try:
+            with open(self.conid_cache_file, "r") as f:
+                entries = json.load(f)
+            return {
+                symbol: (int(entry["conid"]), float(entry["timestamp"]))
+                for symbol, entry in entries.items()
+                if float(entry.get("timestamp", 0)) >= cutoff and entry.get("conid")
+            }
+        except (OSError, AttributeError, KeyError, TypeError, ValueError) as e:
+            # A corrupt or hand-edited cache only costs fresh contract searches
+            logger.warning(f"Ignoring unreadable conid cache: {e}")
+            return {}
+
+    def _flush_conid_cache(self):
+        """Save the conid cache file if contract IDs were resolved since the last save"""
+        if self._conids_dirty:
+            self._conids_dirty = False
+            self._save_conid_cache()
+
+    def _save_conid_cache(self):
+        """Save resolved contract IDs to the conid cache file"""
+        if not self.conid_cache_file:
+            return
+        with self._conid_cache_lock:
+            entries = {
+                symbol: {"conid": conid, "timestamp": timestamp}
+                for symbol, (conid, timestamp) in list(self._conids.items())
+            }
+            try:
+                os.makedirs(os.path.dirname(self.conid_cache_file) or ".", exist_ok=True)
+                # Write a temporary file and swap it in so readers never see a partial cache
+                tmp_file = f"{self.conid_cache_file}.tmp"
+                with open(tmp_file, "w") as f:
+                    json.dump(entries, f, separators=(",", ":"))
+                os.replace(tmp_file, self.conid_cache_file)
+            except Exception as e:
+                logger.warning(f"Failed to save conid cache: {e}")
+
     def place_trailing_stop_order(
         self,
         symbol: str,
@@ -178,6 +584,7 @@ class TradingClient:
         trailing_percent: float,
         action: str = "SELL",
         account: Optional[str] = None,
+        conid: Optional[int] = None,
     ) -> dict:
         """
         Place a trailing stop order
@@ -188,6 +595,7 @@ class TradingClient:
             trailing_percent: Trailing stop percentage (e.g., 5.0 for 5%)
             action: Order action (SELL or BUY)
             account: Account ID (required)
+            conid: Contract ID, if already known (skips the contract search)
 
         Returns:
             Dictionary with order information:
@@ -207,14 +615,14 @@ class TradingClient:
             raise WebAPIError("Account ID is required for placing orders")
 
         try:
-            # Search for contract
-            results = self.client.search_contract(symbol)
-            if not results:
+            # Search for contract; a ticker may have been reassigned since a cached
+            # lookup, so orders only trust recently resolved contract IDs
+            if conid is None:
+                conid = self._resolve_conid(symbol, max_age=CONID_ORDER_MAX_AGE)
+            if not conid:
                 logger.error(f"No contract found for symbol {symbol}")
                 return {"symbol": symbol, "error": "Contract not found", "status": "failed"}
 
-            conid = results[0].get("conid")
-
             # Create order payload
             order_payload = {
                 "conid": conid,
@@ -231,6 +639,8 @@ class TradingClient:
 
             # Handle response
             if isinstance(response, list) and len(response) > 0:
+                self._order_index = None
+                self.invalidate_positions(account)
                 order_id = response[0].get("order_id")
                 logger.info(
                     f"Placed {action} trailing stop order for {quantity} {symbol} "
@@ -252,6 +662,58 @@ class TradingClient:
             logger.error(f"Failed to place trailing stop order: {e}")
             return {"symbol": symbol, "error": str(e), "status": "failed"}
 
+    def place_trailing_stop_orders_batch(
+        self,
+        symbols: List[str],
+        quantity: float,
+        trailing_percent: float,
+        action: str = "SELL",
+        account: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Place the same trailing stop order for several symbols
+
+        Contract searches and order submissions run concurrently; results keep the
+        order of the symbols.
+
+        Args:
+            symbols: Stock symbols
+            quantity: Number of shares per order
+            trailing_percent: Trailing stop percentage (e.g., 5.0 for 5%)
+            action: Order action (SELL or BUY)
+            account: Account ID (required)
+
+        Returns:
+            List of order result dictionaries (see place_trailing_stop_order)
+
+        Raises:
+            WebAPIError: If no account is given
+        """
+        if not account:
+            raise WebAPIError("Account ID is required for placing orders")
+
+        conids = dict(zip(symbols, self._resolve_conids(symbols, max_age=CONID_ORDER_MAX_AGE)))
+
+        def place(symbol: str) -> dict:
+            conid = conids.get(symbol)
+            if not conid:
+                logger.error(f"No contract found for symbol {symbol}")
+                return {"symbol": symbol, "error": "Contract not found", "status": "failed"}
+            try:
+                return self.place_trailing_stop_order(
+                    symbol=symbol,
+                    quantity=quantity,
+                    trailing_percent=trailing_percent,
+                    action=action,
+                    account=account,
+                    conid=conid,
+                )
+            except Exception as e:
+                logger.error(f"Failed to place order for {symbol}: {e}")
+                return {"symbol": symbol, "error": str(e), "status": "failed"}
+
+        return self._map_concurrently(place, symbols)
+
     def place_trailing_stop_for_positions(
         self,
         account: str,
@@ -262,6 +724,9 @@ class TradingClient:
         """
         Place trailing stop orders for all positions in account
 
+        Orders use the contract IDs reported with the positions and are submitted
+        concurrently; results keep the order of the positions.
+
         Args:
             account: Account ID
             trailing_percent: Trailing stop percentage
@@ -274,11 +739,11 @@ class TradingClient:
         Raises:
             WebAPIError: If request fails
         """
-        results = []
-
         try:
             positions = self.get_positions(account)
+            symbol_set = set(symbols) if symbols else None
 
+            targets = []
             for pos in positions:
                 symbol = pos["symbol"]
                 quantity = pos["position"]
@@ -288,19 +753,35 @@ class TradingClient:
                     continue
 
                 # Skip if symbols filter is provided and symbol not in list
-                if symbols and symbol not in symbols:
+                if symbol_set is not None and symbol not in symbol_set:
                     continue
 
-                # Place trailing stop order
-                result = self.place_trailing_stop_order(
+                targets.append((symbol, quantity, pos.get("conid")))
+
+            # Positions carry their contract IDs; search only for any that are missing
+            unresolved = [symbol for symbol, _, conid in targets if not conid]
+            resolved = dict(
+                zip(unresolved, self._resolve_conids(unresolved, max_age=CONID_ORDER_MAX_AGE))
+            )
+
+            def place(target: Tuple[str, float, Optional[int]]) -> dict:
+                symbol, quantity, conid = target
+                conid = conid or resolved.get(symbol)
+                if not conid:
+                    logger.error(f"No contract found for symbol {symbol}")
+                    return {"symbol": symbol, "error": "Contract not found", "status": "failed"}
+
+                return self.place_trailing_stop_order(
                     symbol=symbol,
                     quantity=quantity,
                     trailing_percent=trailing_percent,
                     action=action,
                     account=account,
+                    conid=conid,
                 )
 
-                results.append(result)
+            # Orders are independent, so submit them concurrently
+            results = self._map_concurrently(place, targets)
 
             logger.info(f"Placed {len(results)} trailing stop orders")
             return results
@@ -324,23 +805,17 @@ class TradingClient:
         """
         try:
             if account:
-                orders = self.client.get_live_orders(account)
+                order_list = self._extract_orders(self.client.get_live_orders(account))
             else:
-                # Get all accounts and their orders
+                # Get all accounts and fetch their orders concurrently
                 accounts = self.client.get_accounts()
-                orders = []
-                for acc in accounts:
-                    acc_id = acc.get("id") or acc.get("accountId")
-                    acc_orders = self.client.get_live_orders(acc_id)
-                    orders.extend(acc_orders)
-
-            # Handle different response formats
-            if isinstance(orders, dict):
-                order_list = orders.get("orders", [])
-            elif isinstance(orders, list):
-                order_list = orders
-            else:
-                order_list = []
+                responses = self._map_concurrently(
+                    self.client.get_live_orders,
+                    [acc.get("id") or acc.get("accountId") for acc in accounts],
+                )
+                order_list = [
+                    order for response in responses for order in self._extract_orders(response)
+                ]
 
             logger.info(f"Retrieved {len(order_list)} open orders")
             return order_list
@@ -349,6 +824,24 @@ class TradingClient:
             logger.error(f"Failed to get open orders: {e}")
             raise
 
+    @staticmethod
+    def _extract_orders(response: Any) -> List[Dict[str, Any]]:
+        """
+        Extract order list from a live orders response
+
+        Args:
+            response: Live orders response (dict with "orders" key or list)
+
+        Returns:
+            List of order dictionaries
+        """
+        # Handle different response formats
+        if isinstance(response, dict):
+            return response.get("orders", [])
+        if isinstance(response, list):
+            return response
+        return []
+
     def cancel_order(self, account: str, order_id: int) -> bool:
         """
         Cancel an order
@@ -365,6 +858,8 @@ class TradingClient:
         """
         try:
             self.client.cancel_order(account, order_id)
+            self._order_index = None
+            self.invalidate_positions(account)
             logger.info(f"Cancelled order {order_id}")
             return True
 
@@ -372,6 +867,101 @@ class TradingClient:
             logger.error(f"Failed to cancel order {order_id}: {e}")
             raise
 
+    def cancel_orders(self, order_ids: List[int]) -> List[dict]:
+        """
+        Cancel orders by ID, looking up the account each order belongs to
+
+        Orders that are found are cancelled concurrently; results keep the order of
+        order_ids.
+
+        Args:
+            order_ids: Order IDs to cancel
+
+        Returns:
+            List of result dictionaries with orderId, account, symbol, status
+            and error (if failed)
+
+        Raises:
+            WebAPIError: If open orders cannot be retrieved
+        """
+        order_index = self._get_order_index()
+        results = []
+        targets = []
+
+        for order_id in order_ids:
+            order = order_index.get(order_id)
+            account = order.get("account") if order else None
+            if not account:
+                results.append(
+                    {
+                        "orderId": order_id,
+                        "status": "failed",
+                        "error": "Order not found or no account info",
+                    }
+                )
+                continue
+
+            target = {
+                "orderId": order_id,
+                "account": account,
+                "symbol": order.get("ticker", "N/A"),
+            }
+            results.append(target)
+            targets.append(target)
+
+        # Status and error keys are filled in on the result dictionaries themselves
+        self._cancel_concurrently(targets)
+        return results
+
+    def _get_order_index(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get open orders for all accounts indexed by order ID
+
+        The index is reused for a few seconds and dropped whenever an order is
+        placed or cancelled through this client.
+
+        Returns:
+            Dictionary mapping order ID to order
+        """
+        if self._order_index and time.monotonic() - self._order_index[0] < ORDER_INDEX_TTL:
+            return self._order_index[1]
+
+        index = {order.get("orderId"): order for order in self.get_open_orders()}
+        self._order_index = (time.monotonic(), index)
+        return index
+
+    def _cancel_concurrently(self, targets: List[dict]) -> List[dict]:
+        """
+        Cancel several orders concurrently
+
+        Orders are cancelled directly through the Web API and the open order index
+        is dropped once for the whole batch.
+
+        Args:
+            targets: Dictionaries with orderId, account and symbol keys; each one
+                     gets a status key (and error key on failure) filled in
+
+        Returns:
+            The target dictionaries, in input order
+        """
+
+        def cancel(target: dict) -> dict:
+            try:
+                self.client.cancel_order(target["account"], target["orderId"])
+                target["status"] = "cancelled"
+            except WebAPIError as e:
+                logger.error(f"Failed to cancel order {target['orderId']}: {e}")
+                target["status"] = "failed"
+                target["error"] = str(e)
+            return target
+
+        try:
+            return self._map_concurrently(cancel, targets)
+        finally:
+            self._order_index = None
+            for account in {target["account"] for target in targets}:
+                self.invalidate_positions(account)
+
     def cancel_orders_by_account(
         self,
         account: str,
@@ -392,43 +982,33 @@ class TradingClient:
         Raises:
             WebAPIError: If request fails
         """
-        results = []
-
         try:
             orders = self.get_open_orders(account)
+            symbol_set = set(symbols) if symbols else None
 
+            targets = []
             for order in orders:
                 # Check if order matches filters
-                if symbols and order.get("ticker") not in symbols:
+                if symbol_set is not None and order.get("ticker") not in symbol_set:
                     continue
 
                 if order_type and order.get("orderType") != order_type:
                     continue
 
-                # Cancel the order
                 order_id = order.get("orderId")
-                symbol = order.get("ticker", "N/A")
                 if order_id:
-                    try:
-                        self.cancel_order(account, order_id)
-                        results.append(
-                            {
-                                "orderId": order_id,
-                                "symbol": symbol,
-                                "status": "cancelled",
-                            }
-                        )
-                    except WebAPIError as e:
-                        results.append(
-                            {
-                                "orderId": order_id,
-                                "symbol": symbol,
-                                "status": "failed",
-                                "error": str(e),
-                            }
-                        )
-
-            cancelled_count = len([r for r in results if r["status"] == "cancelled"])
+                    targets.append(
+                        {
+                            "orderId": order_id,
+                            "account": account,
+                            "symbol": order.get("ticker", "N/A"),
+                        }
+                    )
+
+            # Cancel the matching orders concurrently
+            results = self._cancel_concurrently(targets)
+
+            cancelled_count = countOf(map(itemgetter("status"), results), "cancelled")
             logger.info(f"Cancelled {cancelled_count} orders for account {account}")
             return results
 
@@ -451,10 +1031,19 @@ class TradingClient:
             WebAPIError: If request fails
 
         Note:
-            Rate limit: 1 request per 15 minutes
+            Rate limit: 1 request per 15 minutes. Results are reused for the same
+            accounts and period for PERFORMANCE_CACHE_TTL seconds.
         """
+        key = (tuple(sorted(account_ids)), period)
+        cached = self._performance_cache.get(key)
+        if cached and time.monotonic() - cached[0] < PERFORMANCE_CACHE_TTL:
+            logger.info(f"Using cached performance data for {len(account_ids)} accounts")
+            # Hand out copies so callers cannot alter the cached response
+            return copy.deepcopy(cached[1])
+
         try:
             performance = self.client.get_performance(account_ids, period)
+            self._performance_cache[key] = (time.monotonic(), copy.deepcopy(performance))
             logger.info(f"Retrieved performance data for {len(account_ids)} accounts")
             return performance
 
@@ -462,6 +1051,53 @@ class TradingClient:
             logger.error(f"Failed to get performance data: {e}")
             raise
 
+    # Async variants: run the blocking calls in worker threads so callers on an
+    # event loop can await them or fan out with asyncio.gather
+
+    async def connect_async(self) -> bool:
+        """Async variant of connect"""
+        return await asyncio.to_thread(self.connect)
+
+    async def disconnect_async(self):
+        """Async variant of disconnect"""
+        await asyncio.to_thread(self.disconnect)
+
+    async def get_positions_async(self, account: str) -> List[Dict[str, Any]]:
+        """Async variant of get_positions"""
+        return await asyncio.to_thread(self.get_positions, account)
+
+    async def get_market_price_async(self, symbol: str) -> Optional[float]:
+        """Async variant of get_market_price"""
+        return await asyncio.to_thread(self.get_market_price, symbol)
+
+    async def place_trailing_stop_order_async(
+        self,
+        symbol: str,
+        quantity: float,
+        trailing_percent: float,
+        action: str = "SELL",
+        account: Optional[str] = None,
+        conid: Optional[int] = None,
+    ) -> dict:
+        """Async variant of place_trailing_stop_order"""
+        return await asyncio.to_thread(
+            self.place_trailing_stop_order,
+            symbol,
+            quantity,
+            trailing_percent,
+            action=action,
+            account=account,
+            conid=conid,
+        )
+
+    async def get_open_orders_async(self, account: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Async variant of get_open_orders"""
+        return await asyncio.to_thread(self.get_open_orders, account)
+
+    async def cancel_order_async(self, account: str, order_id: int) -> bool:
+        """Async variant of cancel_order"""
+        return await asyncio.to_thread(self.cancel_order, account, order_id)
+
     def __enter__(self):
         """Context manager entry"""
         self.connect()
@@ -470,3 +1106,12 @@ class TradingClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
         self.disconnect()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.connect_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.disconnect_async()
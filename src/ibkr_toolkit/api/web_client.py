@@ -5,18 +5,77 @@ Provides a Python interface to the IBKR Client Portal Web API (RESTful API).
 Handles authentication, session management, rate limiting, and common API operations.
 """
 
+import copy
 import logging
+import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
 
+from ..constants import (
+    MARKET_DATA_MAX_CONIDS,
+    MARKET_DATA_POLL_INTERVAL,
+    MARKET_DATA_TIMEOUT,
+    POSITIONS_PAGE_SIZE,
+    WEB_API_ETAG_CACHE_SIZE,
+    WEB_API_MAX_RETRIES,
+    WEB_API_POOL_SIZE,
+    WEB_API_REAUTH_POLL_INTERVAL,
+    WEB_API_REAUTH_TIMEOUT,
+)
+
 # Disable SSL warnings for self-signed certificate
-requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
+urllib3.disable_warnings(InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_METHODS = frozenset({"GET", "POST", "DELETE"})
+
+# Methods safe to re-send after reauthenticating; orders are POST/DELETE and never retried
+IDEMPOTENT_METHODS = frozenset({"GET"})
+
+# GET endpoints whose responses rarely change and may be revalidated with ETags;
+# live data such as orders, positions and market snapshots is always refetched
+ETAG_CACHEABLE_ENDPOINT = re.compile(
+    r"/(portfolio/accounts|iserver/accounts|iserver/contract/\d+/info|iserver/secdef/\w+)"
+)
+
+# Default snapshot fields: Last, Bid, Ask, Volume, Change
+DEFAULT_SNAPSHOT_FIELDS = "31,84,85,86,88"
+
+
+@lru_cache(maxsize=512)
+def _build_url(base_url: str, endpoint: str) -> str:
+    """Join base URL and endpoint, memoized for endpoints that are requested repeatedly"""
+    return f"{base_url}/{endpoint.lstrip('/')}"
+
+
+@lru_cache(maxsize=256)
+def _join_csv(values: Tuple[Any, ...]) -> str:
+    """Join values into a comma-separated query parameter, memoized for repeated polls"""
+    return ",".join(map(str, values))
+
+
+@lru_cache(maxsize=512)
+def _is_etag_cacheable(endpoint: str) -> bool:
+    """Return True if GET responses from endpoint may be served from the ETag cache"""
+    return ETAG_CACHEABLE_ENDPOINT.fullmatch("/" + endpoint.lstrip("/")) is not None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a Retry-After header, or None if absent or not numeric"""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
 
 class WebAPIError(Exception):
     """Exception raised for Web API errors"""
@@ -29,8 +88,14 @@ class WebAPIError(Exception):
         super().__init__(message)
 
 
+class NotFoundError(WebAPIError):
+    """Exception raised when a Web API endpoint returns 404"""
+
+
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Simple thread-safe token bucket rate limiter for API calls"""
+
+    __slots__ = ("max_requests", "time_window", "rate", "tokens", "last_refill", "_lock")
 
     def __init__(self, max_requests: int = 50, time_window: float = 1.0):
         """
@@ -42,31 +107,33 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
+        # Tokens refill continuously at max_requests per time_window, up to a full bucket
+        self.rate = max_requests / time_window
+        self.tokens = float(max_requests)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
 
     def wait_if_needed(self):
         """Wait if rate limit would be exceeded"""
-        now = time.time()
+        with self._lock:
+            self._wait_locked()
 
-        # Remove old requests outside the time window
-        self.requests = [
-            req_time for req_time in self.requests if now - req_time < self.time_window
-        ]
+    def _wait_locked(self):
+        """Take a token, sleeping until one is available; called with the lock held"""
+        now = time.monotonic()
+        self.tokens = min(self.max_requests, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
 
-        # If at limit, wait
-        if len(self.requests) >= self.max_requests:
-            sleep_time = self.time_window - (now - self.requests[0])
-            if sleep_time > 0:
-                logger.debug(f"Rate limit reached, sleeping for {sleep_time:.2f}s")
-                time.sleep(sleep_time)
-                # Clean up again after sleeping
-                now = time.time()
-                self.requests = [
-                    req_time for req_time in self.requests if now - req_time < self.time_window
-                ]
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return
 
-        # Record this request
-        self.requests.append(now)
+        # Wait for the missing fraction of a token, then spend it
+        sleep_time = (1.0 - self.tokens) / self.rate
+        logger.debug(f"Rate limit reached, sleeping for {sleep_time:.2f}s")
+        time.sleep(sleep_time)
+        self.tokens = 0.0
+        self.last_refill = time.monotonic()
 
 
 class WebAPIClient:
@@ -101,12 +168,34 @@ class WebAPIClient:
         self.verify_ssl = verify_ssl
         self.timeout = timeout
         self.session = requests.Session()
+        # Keep enough pooled connections for concurrent requests from worker threads
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=WEB_API_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Set once on the session rather than building a headers dict per request
+        self.session.headers.update({"Content-Type": "application/json"})
         self.rate_limiter = RateLimiter(max_requests=max_requests_per_second, time_window=1.0)
-        self._last_tickle = 0
+        # (url, params) -> (ETag, parsed body) for conditional GET requests, oldest first
+        self._etag_cache: OrderedDict[Tuple[str, Tuple], Tuple[str, Any]] = OrderedDict()
+        self._etag_lock = threading.Lock()
         self._tickle_interval = 60  # Tickle every 60 seconds
+        # Background keep-alive thread, started on the first request
+        self._tickle_thread: Optional[threading.Thread] = None
+        self._tickle_stop = threading.Event()
+        self._tickle_lock = threading.Lock()
+        # Reauthentication is shared by requests that hit 401 at the same time;
+        # the generation counts completed reauthentications. The lock is held until
+        # the session reports authenticated, so waiting requests retry only then
+        self._reauth_lock = threading.Lock()
+        self._reauth_generation = 0
 
     def _request(
-        self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        retry_auth: bool = True,
     ) -> Any:
         """
         Make HTTP request with rate limiting and error handling
@@ -116,6 +205,8 @@ class WebAPIClient:
             endpoint: API endpoint (without base URL)
             data: Request body data (for POST)
             params: Query parameters
+            retry_auth: Reauthenticate and retry once if the session has expired (401);
+                        only idempotent (GET) requests are retried
 
         Returns:
             Response data (dict, list, or string)
@@ -126,60 +217,90 @@ class WebAPIClient:
         # Rate limiting
         self.rate_limiter.wait_if_needed()
 
-        # Auto-tickle to keep session alive
-        self._auto_tickle()
+        # Keep the session alive from a background thread
+        if self._tickle_thread is None:
+            self._start_auto_tickle()
 
         # Prepare request
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        headers = {"Content-Type": "application/json"}
+        url = _build_url(self.base_url, endpoint)
 
         try:
-            # Make request
-            if method == "GET":
-                response = self.session.get(
-                    url, params=params, verify=self.verify_ssl, timeout=self.timeout
-                )
-            elif method == "POST":
-                response = self.session.post(
+            if method not in SUPPORTED_METHODS:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+
+            # Stable GET responses with an ETag are revalidated instead of refetched
+            cacheable = method == "GET" and _is_etag_cacheable(endpoint)
+            cached = None
+            if cacheable:
+                cache_key = (url, tuple(sorted(params.items())) if params else ())
+                with self._etag_lock:
+                    cached = self._etag_cache.get(cache_key)
+
+            # Make request, honouring Retry-After when the gateway rate-limits us
+            generation = self._reauth_generation
+            retries = 0
+            while True:
+                response = self.session.request(
+                    method,
                     url,
-                    json=data,
                     params=params,
-                    headers=headers,
+                    json=data,
+                    headers={"If-None-Match": cached[0]} if cached else None,
                     verify=self.verify_ssl,
                     timeout=self.timeout,
                 )
-            elif method == "DELETE":
-                response = self.session.delete(
-                    url, params=params, verify=self.verify_ssl, timeout=self.timeout
-                )
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                if response.status_code != 429 or retries >= WEB_API_MAX_RETRIES:
+                    break
+                delay = _parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    break
+                retries += 1
+                logger.debug(f"Rate limited on {endpoint}, retrying in {delay}s")
+                time.sleep(delay)
+                self.rate_limiter.wait_if_needed()
+
+            # Unchanged resource: reuse a copy of the body so callers cannot alter the cache
+            if cached and response.status_code == 304:
+                return copy.deepcopy(cached[1])
 
             # Check status code
-            if response.status_code == 404:
-                raise WebAPIError(f"Endpoint not found: {endpoint}", status_code=404)
-
-            if response.status_code >= 400:
-                error_msg = f"API request failed with status {response.status_code}"
+            status = response.status_code
+            if (
+                status == 401
+                and retry_auth
+                and method in IDEMPOTENT_METHODS
+                and self._reauthenticate_shared(generation)
+            ):
+                return self._request(method, endpoint, data, params, retry_auth=False)
+
+            if status >= 400:
+                if status == 404:
+                    raise NotFoundError(f"Endpoint not found: {endpoint}", status_code=404)
+
+                error_msg = f"API request failed with status {status}"
+                # Parse the error body once for both the message and the exception
+                error_data = None
                 try:
                     error_data = response.json()
                     if "error" in error_data:
                         error_msg += f": {error_data['error']}"
                 except Exception:
                     error_msg += f": {response.text[:200]}"
-                raise WebAPIError(
-                    error_msg,
-                    status_code=response.status_code,
-                    response=response.json() if response.text else None,
-                )
+                raise WebAPIError(error_msg, status_code=status, response=error_data)
 
-            # Parse response
-            if response.text:
+            # Parse response (checking the raw bytes avoids decoding the body twice)
+            if response.content:
                 try:
-                    return response.json()
+                    result = response.json()
                 except ValueError:
                     return response.text
-            return None
+            else:
+                return None
+
+            etag = response.headers.get("ETag")
+            if cacheable and etag:
+                self._store_etag(cache_key, etag, copy.deepcopy(result))
+            return result
 
         except requests.exceptions.Timeout:
             raise WebAPIError(f"Request timeout after {self.timeout}s")
@@ -190,17 +311,109 @@ class WebAPIClient:
         except Exception as e:
             raise WebAPIError(f"Unexpected error: {e}")
 
-    def _auto_tickle(self):
-        """Automatically tickle session if needed"""
-        now = time.time()
-        if now - self._last_tickle > self._tickle_interval:
+    def _reauthenticate_shared(self, generation: int) -> bool:
+        """
+        Reauthenticate once for all requests that failed with 401 in the same generation
+
+        Args:
+            generation: Value of the reauthentication counter when the failed request was sent
+
+        Returns:
+            True if the session has been reauthenticated since that request was sent
+        """
+        with self._reauth_lock:
+            if self._reauth_generation != generation:
+                # Another request already reauthenticated while this one was in flight
+                return True
+            try:
+                self._request("POST", "/iserver/reauthenticate", retry_auth=False)
+            except WebAPIError as e:
+                logger.warning(f"Reauthentication failed: {e}")
+                return False
+            # The reauthenticate endpoint only starts the process; wait until it completes
+            if not self._wait_for_authentication():
+                logger.warning(
+                    f"Session not authenticated {WEB_API_REAUTH_TIMEOUT}s after reauthenticating"
+                )
+                return False
+            self._reauth_generation += 1
+            return True
+
+    def _wait_for_authentication(self) -> bool:
+        """
+        Poll the auth status until the session is authenticated or WEB_API_REAUTH_TIMEOUT expires
+
+        Returns:
+            True if the session reported authenticated in time
+        """
+        deadline = time.monotonic() + WEB_API_REAUTH_TIMEOUT
+        while True:
+            try:
+                status = self._request("GET", "/iserver/auth/status", retry_auth=False)
+                if isinstance(status, dict) and status.get("authenticated"):
+                    return True
+            except WebAPIError as e:
+                logger.debug(f"Auth status check failed: {e}")
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(WEB_API_REAUTH_POLL_INTERVAL)
+
+    def _store_etag(self, cache_key: Tuple[str, Tuple], etag: str, body: Any):
+        """
+        Remember a GET response body by its ETag, evicting the oldest entries
+
+        Args:
+            cache_key: URL and sorted query parameters
+            etag: ETag header of the response
+            body: Parsed response body
+        """
+        with self._etag_lock:
+            self._etag_cache[cache_key] = (etag, body)
+            self._etag_cache.move_to_end(cache_key)
+            while len(self._etag_cache) > WEB_API_ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+
+    def _start_auto_tickle(self):
+        """Start the background thread that keeps the session alive"""
+        with self._tickle_lock:
+            if self._tickle_thread is not None:
+                return
+            self._tickle_stop = threading.Event()
+            self._tickle_thread = threading.Thread(
+                target=self._tickle_loop,
+                args=(self._tickle_stop,),
+                name="ibkr-web-api-tickle",
+                daemon=True,
+            )
+            self._tickle_thread.start()
+
+    def _tickle_loop(self, stop: threading.Event):
+        """
+        Tickle the session every _tickle_interval seconds until stopped
+
+        Args:
+            stop: Event that ends the loop when set
+        """
+        while True:
             try:
                 # Directly call tickle endpoint without going through _request to avoid recursion
                 url = f"{self.base_url}/tickle"
                 self.session.post(url, verify=self.verify_ssl, timeout=self.timeout)
-                self._last_tickle = now
             except Exception as e:
                 logger.warning(f"Auto-tickle failed: {e}")
+            if stop.wait(self._tickle_interval):
+                return
+
+    def close(self):
+        """
+        Stop the background keep-alive thread and release pooled connections
+
+        The client stays usable; the next request restarts the thread and reconnects.
+        """
+        with self._tickle_lock:
+            self._tickle_stop.set()
+            self._tickle_thread = None
+        self.session.close()
 
     # ==================== Session Management ====================
 
@@ -229,7 +442,7 @@ class WebAPIClient:
         Returns:
             Authentication response
         """
-        return self._request("POST", "/iserver/reauthenticate")
+        return self._request("POST", "/iserver/reauthenticate", retry_auth=False)
 
     # ==================== Account Information ====================
 
@@ -290,6 +503,27 @@ class WebAPIClient:
         """
         return self._request("GET", f"/portfolio/{account_id}/positions/{page_id}")
 
+    def iter_positions(self, account_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all account positions, page by page
+
+        Rows from each page are yielded as soon as it arrives, so callers can start
+        processing before later pages have been requested.
+
+        Args:
+            account_id: Account identifier
+
+        Yields:
+            Position objects
+        """
+        page_id = 0
+        while True:
+            page = self.get_positions(account_id, page_id) or []
+            yield from page
+            if len(page) < POSITIONS_PAGE_SIZE:
+                return
+            page_id += 1
+
     # ==================== Contract Search ====================
 
     def search_contract(self, symbol: str, name: bool = False) -> List[Dict[str, Any]]:
@@ -323,7 +557,12 @@ class WebAPIClient:
     # ==================== Market Data ====================
 
     def get_market_snapshot(
-        self, conids: List[int], fields: Optional[List[str]] = None
+        self,
+        conids: List[int],
+        fields: Optional[List[str]] = None,
+        wait: bool = False,
+        timeout: float = MARKET_DATA_TIMEOUT,
+        poll_interval: float = MARKET_DATA_POLL_INTERVAL,
     ) -> List[Dict[str, Any]]:
         """
         Get market data snapshot for contracts
@@ -331,21 +570,65 @@ class WebAPIClient:
         Args:
             conids: List of contract IDs
             fields: List of field IDs to retrieve (default: last, bid, ask, volume, change)
+            wait: Repeat the request until every contract has a last price (field 31)
+            timeout: Maximum seconds to keep polling when wait is True
+            poll_interval: Seconds between polls when wait is True
 
         Returns:
             List of market data snapshots
 
         Note:
-            First call initializes data stream, may return empty. Call again for data.
+            First call initializes data stream, may return empty. Call again for data,
+            or pass wait=True to poll until prices arrive or the timeout expires.
+            Requests for more than MARKET_DATA_MAX_CONIDS contracts are split into
+            several requests and the results combined.
+        """
+        if not wait:
+            return self._request_snapshot(conids, fields)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._request_snapshot(conids, fields)
+            priced = sum(1 for item in snapshot if item.get("31"))
+            if priced >= len(conids) or time.monotonic() >= deadline:
+                return snapshot
+            time.sleep(poll_interval)
+
+    def _request_snapshot(
+        self, conids: List[int], fields: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Request one market data snapshot, split into chunks of MARKET_DATA_MAX_CONIDS"""
+        fields_str = DEFAULT_SNAPSHOT_FIELDS if fields is None else _join_csv(tuple(fields))
+
+        snapshot: List[Dict[str, Any]] = []
+        for start in range(0, len(conids), MARKET_DATA_MAX_CONIDS):
+            chunk = tuple(conids[start : start + MARKET_DATA_MAX_CONIDS])
+            params = {"conids": _join_csv(chunk), "fields": fields_str}
+            snapshot.extend(
+                self._request("GET", "/iserver/marketdata/snapshot", params=params) or []
+            )
+        return snapshot
+
+    def unsubscribe_market_data(self, conid: int) -> Dict[str, Any]:
         """
-        if fields is None:
-            fields = ["31", "84", "85", "86", "88"]  # Last, Bid, Ask, Volume, Change
+        Stop the market data stream for a contract
 
-        conids_str = ",".join(str(c) for c in conids)
-        fields_str = ",".join(fields)
+        Args:
+            conid: Contract ID
+
+        Returns:
+            Unsubscribe response
+        """
+        return self._request("POST", "/iserver/marketdata/unsubscribe", data={"conid": conid})
 
-        params = {"conids": conids_str, "fields": fields_str}
-        return self._request("GET", "/iserver/marketdata/snapshot", params=params)
+    def unsubscribe_all_market_data(self) -> Dict[str, Any]:
+        """
+        Stop all market data streams
+
+        Returns:
+            Unsubscribe response
+        """
+        return self._request("GET", "/iserver/marketdata/unsubscribeall")
 
     # ==================== Orders ====================
 
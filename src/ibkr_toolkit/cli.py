@@ -7,12 +7,13 @@ import argparse
 import json
 import sys
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+from openpyxl.styles import Alignment, Font, PatternFill, numbers
 
 from .api.flex_query import FlexQueryClient
-from .config import Config
+from .config import load_config
 from .constants import TIMESTAMP_FORMAT
 from .exceptions import APIError, ConfigurationError, IBKRTaxError
 from .parsers.data_parser import (
@@ -222,8 +223,6 @@ def _format_sheet(writer: pd.ExcelWriter, sheet_name: str, df: pd.DataFrame) ->
         sheet_name: Name of the sheet to format
         df: DataFrame that was written to the sheet
     """
-    from openpyxl.styles import Alignment, Font, PatternFill, numbers
-
     worksheet = writer.sheets[sheet_name]
 
     # Define color scheme - Bloomberg Terminal style
@@ -377,9 +376,6 @@ def _get_formatted_cell_length(cell) -> int:
     Returns:
         Estimated display length
     """
-
-    from openpyxl.styles import numbers
-
     if cell.value is None:
         return 0
 
@@ -438,8 +434,6 @@ def _merge_summary_categories(writer: pd.ExcelWriter, sheet_name: str, df: pd.Da
         sheet_name: Name of the sheet
         df: Summary DataFrame
     """
-    from openpyxl.styles import Alignment
-
     worksheet = writer.sheets[sheet_name]
 
     # Find consecutive rows with same category
@@ -672,10 +666,17 @@ Examples:
     return parser.parse_args()
 
 
-def main() -> None:
-    """Main execution function"""
+def main(args: Optional[argparse.Namespace] = None) -> None:
+    """
+    Main execution function
+
+    Args:
+        args: Arguments already parsed by the ibkr-toolkit entry point (parsed from
+            the command line when omitted)
+    """
     # Parse command-line arguments
-    args = parse_args()
+    if args is None:
+        args = parse_args()
 
     print_banner()
 
@@ -683,7 +684,7 @@ def main() -> None:
     logger = setup_logger("ibkr_tax", level="INFO", console=True)
 
     # Validate arguments
-    if sum([bool(args.year), bool(args.from_year), args.all]) > 1:
+    if sum((bool(args.year), bool(args.from_year), args.all)) > 1:
         error_msg = (
             "Cannot specify multiple date options: "
             "--year, --from-year, and --all are mutually exclusive"
@@ -709,7 +710,7 @@ def main() -> None:
         if args.all:
             # Need to load config to get FIRST_TRADE_YEAR
             try:
-                temp_config = Config()
+                temp_config = load_config()
                 start_year = temp_config.first_trade_year
                 if not start_year:
                     logger.error("FIRST_TRADE_YEAR not set in .env file")
@@ -730,7 +731,7 @@ def main() -> None:
         # Step 1: Load configuration
         logger.info("Step 1: Loading configuration...")
         try:
-            config = Config()
+            config = load_config()
             logger.info("Configuration loaded successfully")
             logger.info(f"Exchange rate: 1 USD = {config.exchange_rate} CNY")
             logger.info(f"Use dynamic rates: {config.use_dynamic_rates}")
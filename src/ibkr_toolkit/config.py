@@ -3,6 +3,7 @@ Configuration management for IBKR Tax Tool
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -28,7 +29,8 @@ class Config:
         else:
             load_dotenv()
 
-        # Cache configuration values
+        # Cache configuration values; the remaining settings are read from the
+        # environment on first access and then cached per instance
         self._token = os.getenv("IBKR_FLEX_TOKEN", "")
         self._query_id = os.getenv("IBKR_QUERY_ID", "")
 
@@ -56,7 +58,7 @@ class Config:
         """Get IBKR Query ID"""
         return self._query_id
 
-    @property
+    @cached_property
     def exchange_rate(self) -> float:
         """Get default USD to CNY exchange rate"""
         try:
@@ -64,27 +66,27 @@ class Config:
         except ValueError:
             return DEFAULT_USD_CNY_RATE
 
-    @property
+    @cached_property
     def use_dynamic_rates(self) -> bool:
         """Check if dynamic exchange rates should be used"""
         return os.getenv("USE_DYNAMIC_EXCHANGE_RATES", "true").lower() == "true"
 
-    @property
+    @cached_property
     def output_dir(self) -> Path:
         """Get output directory path"""
         return Path(os.getenv("OUTPUT_DIR", DEFAULT_OUTPUT_DIR))
 
-    @property
+    @cached_property
     def log_level(self) -> str:
         """Get log level"""
         return os.getenv("LOG_LEVEL", "INFO").upper()
 
-    @property
+    @cached_property
     def log_file(self) -> Optional[str]:
         """Get log file path"""
         return os.getenv("LOG_FILE")
 
-    @property
+    @cached_property
     def first_trade_year(self) -> Optional[int]:
         """Get first year of trading"""
         year_str = os.getenv("FIRST_TRADE_YEAR")
@@ -96,38 +98,58 @@ class Config:
         return None
 
     # Trading API Configuration
-    @property
+    @cached_property
     def ibkr_gateway_host(self) -> str:
         """Get IBKR Gateway host"""
         return os.getenv("IBKR_GATEWAY_HOST", "127.0.0.1")
 
-    @property
+    @cached_property
     def ibkr_gateway_port(self) -> int:
         """Get IBKR Gateway port"""
         return int(os.getenv("IBKR_GATEWAY_PORT", "7497"))
 
-    @property
+    @cached_property
     def ibkr_client_id(self) -> int:
         """Get IBKR client ID"""
         return int(os.getenv("IBKR_CLIENT_ID", "1"))
 
     # Web API Configuration
-    @property
+    @cached_property
     def web_api_url(self) -> str:
         """Get Client Portal Gateway base URL"""
         return os.getenv("IBKR_WEB_API_URL", "https://localhost:5001/v1/api")
 
-    @property
+    @cached_property
     def web_api_verify_ssl(self) -> bool:
         """Check if SSL verification should be enabled for Web API"""
         return os.getenv("IBKR_WEB_API_VERIFY_SSL", "false").lower() == "true"
 
-    @property
+    @cached_property
     def web_api_timeout(self) -> int:
         """Get Web API request timeout in seconds"""
         return int(os.getenv("IBKR_WEB_API_TIMEOUT", "30"))
 
-    @property
+    @cached_property
     def web_api_max_requests_per_second(self) -> int:
         """Get Web API rate limit (requests per second)"""
         return int(os.getenv("IBKR_WEB_API_MAX_REQUESTS_PER_SECOND", "50"))
+
+
+@lru_cache(maxsize=None)
+def load_config(env_file: Optional[str] = None) -> Config:
+    """
+    Load configuration once per process
+
+    Repeated calls with the same env file return the same Config instance instead
+    of locating and parsing the .env file again.
+
+    Args:
+        env_file: Optional path to .env file
+
+    Returns:
+        Shared Config instance
+
+    Raises:
+        ConfigurationError: If required config is missing (failures are not cached)
+    """
+    return Config(env_file)
@@ -38,6 +38,26 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_LOG_LEVEL = "INFO"
 
+# Web API Configuration
+WEB_API_MAX_WORKERS = 8  # Maximum concurrent requests for batched operations
+WEB_API_POOL_SIZE = 16  # keep-alive connections per host in the HTTP session
+WEB_API_ETAG_CACHE_SIZE = 256  # GET responses kept for conditional requests
+WEB_API_MAX_RETRIES = 3  # retries of a rate-limited (HTTP 429) request
+WEB_API_REAUTH_TIMEOUT = 10.0  # seconds to wait for the session to authenticate after a 401
+WEB_API_REAUTH_POLL_INTERVAL = 0.5  # seconds between auth status polls while reauthenticating
+MARKET_DATA_TIMEOUT = 2.0  # seconds to wait for a snapshot stream to deliver prices
+MARKET_DATA_POLL_INTERVAL = 0.1  # seconds between snapshot polls
+PRICE_CACHE_TTL = 30.0  # seconds a fetched market price is reused
+ORDER_INDEX_TTL = 5.0  # seconds the open order ID index is reused
+POSITIONS_CACHE_TTL = 120.0  # seconds fetched account positions are reused
+PERFORMANCE_CACHE_TTL = 900.0  # seconds; performance endpoint allows 1 request per 15 min
+MARKET_DATA_MAX_SUBSCRIPTIONS = 90  # streaming market data lines kept open (IBKR caps at 100)
+MARKET_DATA_MAX_CONIDS = 100  # contracts per snapshot request
+POSITIONS_PAGE_SIZE = 100  # rows per portfolio positions page
+CONID_CACHE_FILE = "data/cache/conid_cache.json"
+CONID_CACHE_DAYS = 90  # contract IDs only change with corporate actions
+CONID_ORDER_MAX_AGE = 3600.0  # seconds a cached contract ID is trusted for placing orders
+
 # API Retry Configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
@@ -4,35 +4,14 @@ Main CLI entry point for IBKR Toolkit
 
 import argparse
 import sys
+from functools import lru_cache
+from typing import Optional
 
 from ibkr_toolkit import __version__
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """
-    Create the main argument parser with subcommands
-
-    Returns:
-        ArgumentParser: Main parser with subcommands
-    """
-    parser = argparse.ArgumentParser(
-        prog="ibkr-toolkit",
-        description="A comprehensive toolkit for IBKR trading data processing and management",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-
-    parser.add_argument("-v", "--version", action="version", version=f"%(prog)s {__version__}")
-
-    # Create subcommands
-    subparsers = parser.add_subparsers(
-        title="commands",
-        description="Available commands",
-        dest="command",
-        required=True,
-        help="Command to execute",
-    )
-
-    # Report subcommand
+def _add_report_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the report subcommand"""
     report_parser = subparsers.add_parser(
         "report",
         help="Generate tax reports from IBKR Flex Query data",
@@ -57,7 +36,9 @@ def create_parser() -> argparse.ArgumentParser:
         ),
     )
 
-    # Stop-loss subcommand
+
+def _add_stop_loss_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the stop-loss subcommand and its commands"""
     stop_loss_parser = subparsers.add_parser(
         "stop-loss",
         help="Place and manage trailing stop orders in IB system",
@@ -85,6 +66,7 @@ def create_parser() -> argparse.ArgumentParser:
     place_parser.add_argument(
         "--symbols",
         nargs="+",
+        default=None,
         help="Specific symbols to place orders for (if not specified, all positions)",
     )
 
@@ -108,7 +90,7 @@ def create_parser() -> argparse.ArgumentParser:
 
     # Orders command - view open orders
     orders_parser = stop_loss_subparsers.add_parser("orders", help="View open orders")
-    orders_parser.add_argument("--account", help="Filter by account ID (optional)")
+    orders_parser.add_argument("--account", default=None, help="Filter by account ID (optional)")
 
     # Cancel command - cancel orders
     cancel_parser = stop_loss_subparsers.add_parser("cancel", help="Cancel trailing stop orders")
@@ -118,14 +100,19 @@ def create_parser() -> argparse.ArgumentParser:
         type=int,
         help="Order IDs to cancel (leave empty to use --account filter)",
     )
-    cancel_parser.add_argument("--account", help="Cancel all trailing stop orders for this account")
+    cancel_parser.add_argument(
+        "--account", default=None, help="Cancel all trailing stop orders for this account"
+    )
     cancel_parser.add_argument(
         "--symbols",
         nargs="+",
+        default=None,
         help="Only cancel orders for these symbols (requires --account)",
     )
 
-    # Web API subcommand
+
+def _add_web_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the web subcommand and its commands"""
     web_parser = subparsers.add_parser(
         "web",
         help="Query account data using IBKR Web API",
@@ -182,7 +169,9 @@ def create_parser() -> argparse.ArgumentParser:
         "--format", choices=["table", "json"], default="table", help="Output format"
     )
 
-    # Performance subcommand
+
+def _add_performance_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the performance subcommand"""
     performance_parser = subparsers.add_parser(
         "performance",
         help="Query account performance data",
@@ -206,93 +195,106 @@ def create_parser() -> argparse.ArgumentParser:
         help="Output format (default: table)",
     )
 
+
+# Top-level command -> function adding its subparser
+_SUBPARSER_BUILDERS = {
+    "report": _add_report_parser,
+    "stop-loss": _add_stop_loss_parser,
+    "web": _add_web_parser,
+    "performance": _add_performance_parser,
+}
+
+
+@lru_cache(maxsize=None)
+def create_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Create the main argument parser with subcommands
+
+    The parser is built once per process and reused by later calls.
+
+    Args:
+        command: Only add the subparser for this command (all subcommands if None)
+
+    Returns:
+        ArgumentParser: Main parser with subcommands
+    """
+    parser = argparse.ArgumentParser(
+        prog="ibkr-toolkit",
+        description="A comprehensive toolkit for IBKR trading data processing and management",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument("-v", "--version", action="version", version=f"%(prog)s {__version__}")
+
+    # Create subcommands
+    subparsers = parser.add_subparsers(
+        title="commands",
+        description="Available commands",
+        dest="command",
+        required=True,
+        help="Command to execute",
+    )
+
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for add_parser in _SUBPARSER_BUILDERS.values():
+            add_parser(subparsers)
+
     return parser
 
 
 def main() -> None:
     """Main entry point for CLI"""
-    parser = create_parser()
+    # Only build the parser branch for the requested command; --help and unknown
+    # commands get the full parser
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = create_parser(command if command in _SUBPARSER_BUILDERS else None)
     args = parser.parse_args()
 
     # Route to appropriate command handler
     if args.command == "report":
         from ibkr_toolkit.cli import main as report_main
 
-        # Pass arguments to report main
-        sys.argv = ["ibkr-toolkit-report"]
-        if args.year:
-            sys.argv.extend(["--year", str(args.year)])
-        if args.from_year:
-            sys.argv.extend(["--from-year", str(args.from_year)])
-        if args.all:
-            sys.argv.append("--all")
-
-        report_main()
+        report_main(args)
 
     elif args.command == "stop-loss":
         from ibkr_toolkit.stop_loss_cli import main as stop_loss_main
 
-        # Pass arguments to stop-loss main
-        sys.argv = ["ibkr-toolkit-stop-loss", args.stop_loss_command]
-        if args.stop_loss_command == "place":
-            sys.argv.extend([args.account, "--percent", str(args.percent)])
-            if args.symbols:
-                sys.argv.extend(["--symbols"] + args.symbols)
-        elif args.stop_loss_command == "place-buy":
-            sys.argv.extend([args.account, "--percent", str(args.percent)])
-            sys.argv.extend(["--symbols"] + args.symbols)
-        elif args.stop_loss_command == "orders":
-            if hasattr(args, "account") and args.account:
-                sys.argv.extend(["--account", args.account])
-        elif args.stop_loss_command == "cancel":
-            if args.order_ids:
-                sys.argv.extend([str(oid) for oid in args.order_ids])
-            if hasattr(args, "account") and args.account:
-                sys.argv.extend(["--account", args.account])
-            if hasattr(args, "symbols") and args.symbols:
-                sys.argv.extend(["--symbols"] + args.symbols)
-
-        stop_loss_main()
+        # The stop-loss module names its subcommand "command"
+        stop_loss_main(argparse.Namespace(**{**vars(args), "command": args.stop_loss_command}))
 
     elif args.command == "web":
-        from ibkr_toolkit.config import Config
-        from ibkr_toolkit.web_cli import (
-            account_info_command,
-            orders_command,
-            positions_command,
-            search_command,
-            snapshot_command,
-            summary_command,
-        )
-
-        config = Config()
+        from ibkr_toolkit import web_cli
+        from ibkr_toolkit.config import load_config
+
+        # web_command -> (handler, positional argument passed after config, if any)
+        handlers = {
+            "account-info": (web_cli.account_info_command, None),
+            "positions": (web_cli.positions_command, "account_id"),
+            "summary": (web_cli.summary_command, "account_id"),
+            "orders": (web_cli.orders_command, "account_id"),
+            "search": (web_cli.search_command, "symbol"),
+            "snapshot": (web_cli.snapshot_command, "conids"),
+        }
+        handler, arg_name = handlers[args.web_command]
+        handler_args = (getattr(args, arg_name),) if arg_name else ()
 
         try:
-            if args.web_command == "account-info":
-                sys.exit(account_info_command(config, args.format))
-            elif args.web_command == "positions":
-                sys.exit(positions_command(config, args.account_id, args.format))
-            elif args.web_command == "summary":
-                sys.exit(summary_command(config, args.account_id, args.format))
-            elif args.web_command == "orders":
-                sys.exit(orders_command(config, args.account_id, args.format))
-            elif args.web_command == "search":
-                sys.exit(search_command(config, args.symbol, args.format))
-            elif args.web_command == "snapshot":
-                sys.exit(snapshot_command(config, args.conids, args.format))
+            # Configuration is only loaded once a command has been selected
+            config = load_config()
+            sys.exit(handler(config, *handler_args, args.format))
         except KeyboardInterrupt:
             print("\nOperation cancelled by user")
             sys.exit(130)
 
     elif args.command == "performance":
-        from ibkr_toolkit.config import Config
+        from ibkr_toolkit.config import load_config
         from ibkr_toolkit.performance_cli import view_performance
 
-        config = Config()
-
         try:
             view_performance(
-                config=config,
+                config=load_config(),
                 accounts=args.accounts,
                 period=args.period,
                 output_format=args.format,
@@ -4,20 +4,17 @@ Performance query command-line interface for IBKR Web API
 This module provides CLI commands for querying account performance data.
 """
 
+import io
 import json
 import sys
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set, TextIO, Tuple
 
-from .api.trading_client import TradingClient
-from .api.web_client import WebAPIError
-from .config import Config
-from .utils.logging import setup_logger
-
-logger = setup_logger("ibkr_toolkit.performance_cli", level="INFO", console=True)
+if TYPE_CHECKING:
+    from .config import Config
 
 
 def view_performance(
-    config: Config,
+    config: "Config",
     accounts: List[str],
     period: str = "1M",
     output_format: str = "table",
@@ -31,6 +28,13 @@ def view_performance(
         period: Time period (1D, 7D, MTD, 1M, YTD, 1Y)
         output_format: Output format (table, json)
     """
+    # The Web API client stack is only imported when performance data is requested
+    from .api.trading_client import TradingClient
+    from .api.web_client import WebAPIError
+    from .utils.logging import setup_logger
+
+    logger = setup_logger("ibkr_toolkit.performance_cli", level="INFO", console=True)
+
     client = TradingClient(
         base_url=config.web_api_url,
         verify_ssl=config.web_api_verify_ssl,
@@ -82,49 +86,68 @@ def _display_performance_table(data: dict, accounts: List[str], period: str):
         accounts: List of account IDs
         period: Time period
     """
-    print("=" * 80)
-    print(f"Account Performance - {period}")
-    print("=" * 80)
-    print("")
+    # Render the whole report into a buffer and write it to stdout at once
+    buf = io.StringIO()
+    print("=" * 80, file=buf)
+    print(f"Account Performance - {period}", file=buf)
+    print("=" * 80, file=buf)
+    print("", file=buf)
+
+    # Set of requested accounts for constant-time filtering (empty means all accounts)
+    account_set = set(accounts)
 
     # Handle IBKR performance API response format
     if isinstance(data, dict):
         # Display NAV data if available
-        if "nav" in data and "data" in data["nav"]:
-            for account_data in data["nav"]["data"]:
-                account_id = account_data.get("id")
-                if account_id in accounts or not accounts:
-                    _display_nav_summary(account_data, period)
+        for account_data, _ in _iter_section(data, "nav", account_set):
+            _display_nav_summary(account_data, period, buf)
 
         # Display cumulative returns if available
-        if "cps" in data and "data" in data["cps"]:
-            for account_data in data["cps"]["data"]:
-                account_id = account_data.get("id")
-                if account_id in accounts or not accounts:
-                    _display_returns_summary(account_data, data["cps"].get("dates", []))
+        for account_data, dates in _iter_section(data, "cps", account_set):
+            _display_returns_summary(account_data, dates, buf)
 
         # Display time period returns if available
-        if "tpps" in data and "data" in data["tpps"]:
-            for account_data in data["tpps"]["data"]:
-                account_id = account_data.get("id")
-                if account_id in accounts or not accounts:
-                    _display_period_returns(account_data, data["tpps"].get("dates", []))
+        for account_data, dates in _iter_section(data, "tpps", account_set):
+            _display_period_returns(account_data, dates, buf)
 
         # If old format, try old display methods
         if "nav" not in data and "cps" not in data and "tpps" not in data:
-            _display_raw_data(data)
+            _display_raw_data(data, buf)
+
+    print("", file=buf)
+    print("=" * 80, file=buf)
 
-    print("")
-    print("=" * 80)
+    sys.stdout.write(buf.getvalue())
 
 
-def _display_nav_summary(account_data: dict, period: str):
+def _iter_section(data: dict, key: str, account_set: Set[str]) -> Iterator[Tuple[dict, List[str]]]:
+    """
+    Iterate over the requested accounts in one section of the performance response
+
+    Args:
+        data: Performance data from API
+        key: Section key (nav, cps, tpps)
+        account_set: Account IDs to include (all accounts if empty)
+
+    Yields:
+        Tuples of (account data, section dates)
+    """
+    section = data.get(key)
+    if not section or "data" not in section:
+        return
+    dates = section.get("dates", [])
+    for account_data in section["data"]:
+        if not account_set or account_data.get("id") in account_set:
+            yield account_data, dates
+
+
+def _display_nav_summary(account_data: dict, period: str, out: Optional[TextIO] = None):
     """Display NAV summary for an account"""
     account_id = account_data.get("id", "Unknown")
-    print(f"\nAccount: {account_id}")
-    print("-" * 80)
-    print("Net Asset Value (NAV)")
-    print("")
+    print(f"\nAccount: {account_id}", file=out)
+    print("-" * 80, file=out)
+    print("Net Asset Value (NAV)", file=out)
+    print("", file=out)
 
     # Get start NAV
     start_nav_info = account_data.get("startNAV", {})
@@ -141,19 +164,19 @@ def _display_nav_summary(account_data: dict, period: str):
     currency = account_data.get("baseCurrency", "USD")
 
     if start_nav:
-        print(f"  Start NAV ({start_date}):  {currency} {start_nav:,.2f}")
+        print(f"  Start NAV ({start_date}):  {currency} {start_nav:,.2f}", file=out)
     if end_nav:
-        print(f"  End NAV   ({end_period}):  {currency} {end_nav:,.2f}")
+        print(f"  End NAV   ({end_period}):  {currency} {end_nav:,.2f}", file=out)
 
     if start_nav and end_nav:
         change = end_nav - start_nav
         change_pct = (change / start_nav * 100) if start_nav != 0 else 0
-        print(f"  Change:              {currency} {change:+,.2f} ({change_pct:+.2f}%)")
+        print(f"  Change:              {currency} {change:+,.2f} ({change_pct:+.2f}%)", file=out)
 
-    print("")
+    print("", file=out)
 
 
-def _display_returns_summary(account_data: dict, dates: List[str]):
+def _display_returns_summary(account_data: dict, dates: List[str], out: Optional[TextIO] = None):
     """Display cumulative returns summary"""
     account_id = account_data.get("id", "Unknown")
     returns = account_data.get("returns", [])
@@ -161,31 +184,36 @@ def _display_returns_summary(account_data: dict, dates: List[str]):
     if not returns:
         return
 
-    print(f"\nCumulative Returns - {account_id}")
-    print("-" * 80)
+    print(f"\nCumulative Returns - {account_id}", file=out)
+    print("-" * 80, file=out)
 
     # Show latest return
     latest_return = returns[-1] * 100 if returns else 0
     latest_date = dates[-1] if dates and len(dates) >= len(returns) else ""
 
-    print(f"  Latest Return ({latest_date}):  {latest_return:+.2f}%")
+    print(f"  Latest Return ({latest_date}):  {latest_return:+.2f}%", file=out)
 
     # Show best and worst returns
     if len(returns) > 1:
-        best_return = max(returns) * 100
-        worst_return = min(returns) * 100
-        best_idx = returns.index(max(returns))
-        worst_idx = returns.index(min(returns))
+        # Find best and worst in one pass (first occurrence wins on ties)
+        best_idx = worst_idx = 0
+        for i, ret in enumerate(returns):
+            if ret > returns[best_idx]:
+                best_idx = i
+            if ret < returns[worst_idx]:
+                worst_idx = i
+        best_return = returns[best_idx] * 100
+        worst_return = returns[worst_idx] * 100
         best_date = dates[best_idx] if dates and len(dates) > best_idx else ""
         worst_date = dates[worst_idx] if dates and len(dates) > worst_idx else ""
 
-        print(f"  Best Return  ({best_date}):  {best_return:+.2f}%")
-        print(f"  Worst Return ({worst_date}):  {worst_return:+.2f}%")
+        print(f"  Best Return  ({best_date}):  {best_return:+.2f}%", file=out)
+        print(f"  Worst Return ({worst_date}):  {worst_return:+.2f}%", file=out)
 
-    print("")
+    print("", file=out)
 
 
-def _display_period_returns(account_data: dict, dates: List[str]):
+def _display_period_returns(account_data: dict, dates: List[str], out: Optional[TextIO] = None):
     """Display period returns (monthly, etc.)"""
     account_id = account_data.get("id", "Unknown")
     returns = account_data.get("returns", [])
@@ -193,20 +221,20 @@ def _display_period_returns(account_data: dict, dates: List[str]):
     if not returns:
         return
 
-    print(f"\nPeriod Returns - {account_id}")
-    print("-" * 80)
+    print(f"\nPeriod Returns - {account_id}", file=out)
+    print("-" * 80, file=out)
+
+    # The API uses one date format per series, so check it once
+    # (YYYYMM -> YYYY-MM, anything else is shown as is)
+    if dates and len(dates[0]) == 6:
+        dates = [f"{date[:4]}-{date[4:]}" for date in dates]
 
     # Display each period
-    for i, (date, ret) in enumerate(zip(dates, returns)):
-        ret_pct = ret * 100
-        # Format date (YYYYMM -> YYYY-MM)
-        if len(date) == 6:
-            formatted_date = f"{date[:4]}-{date[4:]}"
-        else:
-            formatted_date = date
-        print(f"  {formatted_date}:  {ret_pct:+.2f}%")
+    lines = [f"  {date}:  {ret * 100:+.2f}%" for date, ret in zip(dates, returns)]
+    if lines:
+        print("\n".join(lines), file=out)
 
-    print("")
+    print("", file=out)
 
 
 def _display_nav_data(nav_data: dict):
@@ -270,20 +298,20 @@ def _display_account_metrics(metrics: dict):
                 print(f"{label:25} {value}")
 
 
-def _display_raw_data(data: dict):
+def _display_raw_data(data: dict, out: Optional[TextIO] = None):
     """Display raw data when structure is unknown"""
-    print("Performance Data:")
-    print("-" * 80)
+    print("Performance Data:", file=out)
+    print("-" * 80, file=out)
 
     for key, value in data.items():
         if isinstance(value, (int, float)):
-            print(f"{key:25} {value:>15,.2f}")
+            print(f"{key:25} {value:>15,.2f}", file=out)
         elif isinstance(value, dict):
-            print(f"\n{key}:")
+            print(f"\n{key}:", file=out)
             for sub_key, sub_value in value.items():
                 if isinstance(sub_value, (int, float)):
-                    print(f"  {sub_key:23} {sub_value:>15,.2f}")
+                    print(f"  {sub_key:23} {sub_value:>15,.2f}", file=out)
                 else:
-                    print(f"  {sub_key:23} {sub_value}")
+                    print(f"  {sub_key:23} {sub_value}", file=out)
         else:
-            print(f"{key:25} {value}")
+            print(f"{key:25} {value}", file=out)
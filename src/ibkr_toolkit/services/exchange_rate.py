@@ -6,7 +6,7 @@ Automatically fetches USD to CNY exchange rates from various sources
 import json
 import os
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 import requests
 
@@ -23,6 +23,8 @@ class ExchangeRateService:
         """
         self.cache_file = cache_file
         self.cache = self._load_cache()
+        # Dates whose API lookup failed in this run; not persisted so later runs retry
+        self._failed: Set[str] = set()
 
     def _load_cache(self) -> Dict[str, float]:
         """Load cached exchange rates from file"""
@@ -64,6 +66,10 @@ class ExchangeRateService:
         if normalized_date in self.cache:
             return self.cache[normalized_date]
 
+        # Don't hit the API again for a date that already failed in this run
+        if normalized_date in self._failed:
+            return default_rate
+
         # Try to fetch from API
         rate = self._fetch_rate_from_api(normalized_date)
 
@@ -72,10 +78,9 @@ class ExchangeRateService:
             self._save_cache()
             return rate
         else:
-            # Use default rate and cache it
+            # Use default rate without caching it, so the next run retries the API
             print(f"  Warning: Using default rate {default_rate} for {normalized_date}")
-            self.cache[normalized_date] = default_rate
-            self._save_cache()
+            self._failed.add(normalized_date)
             return default_rate
 
     def _fetch_rate_from_api(self, date: str) -> Optional[float]:
@@ -124,9 +129,7 @@ class ExchangeRateService:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
-            if "rates" in data and "CNY" in data["rates"]:
-                return float(data["rates"]["CNY"])
+            return self._parse_cny_rate(response.json())
 
         except Exception:
             pass
@@ -150,15 +153,28 @@ class ExchangeRateService:
             response = requests.get(url, params=params, timeout=10)
 
             if response.status_code == 200:
-                data = response.json()
-                if "rates" in data and "CNY" in data["rates"]:
-                    return float(data["rates"]["CNY"])
+                return self._parse_cny_rate(response.json())
 
         except Exception:
             pass
 
         return None
 
+    @staticmethod
+    def _parse_cny_rate(data: Any) -> Optional[float]:
+        """
+        Extract USD to CNY rate from an API response payload
+
+        Args:
+            data: Decoded JSON response with a "rates" mapping
+
+        Returns:
+            USD to CNY rate or None if the payload has no usable rate
+        """
+        rates = data.get("rates") if isinstance(data, dict) else None
+        rate = rates.get("CNY") if isinstance(rates, dict) else None
+        return float(rate) if rate is not None else None
+
     def get_monthly_average_rate(self, year: int, month: int, default_rate: float = 7.2) -> float:
         """
         Get average exchange rate for a specific month
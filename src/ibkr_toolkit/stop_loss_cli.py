@@ -4,14 +4,67 @@ Command-line interface for IBKR Stop Loss Manager
 """
 
 import argparse
+import atexit
 import sys
-from typing import List, Optional
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from .api.trading_client import TradingClient
-from .config import Config
+from .config import Config, load_config
+from .constants import CONID_CACHE_FILE
 from .exceptions import APIError, ConfigurationError, IBKRTaxError
 from .utils.logging import setup_logger
 
+# Connected trading clients shared by the commands run in this process,
+# keyed by (Web API URL, verify SSL, timeout)
+_sessions: Dict[Tuple[str, bool, int], TradingClient] = {}
+
+
+@contextmanager
+def trading_session(config: Config) -> Iterator[TradingClient]:
+    """
+    Provide a connected trading client, reused by later commands in this process
+
+    The client connects on first use and disconnects when the process exits. A client
+    that fails to authenticate is used for this command only and disconnected after
+    it, so the next command tries to connect again.
+
+    Args:
+        config: Configuration object
+
+    Yields:
+        TradingClient (connected unless authentication failed)
+    """
+    key = (config.web_api_url, config.web_api_verify_ssl, config.web_api_timeout)
+    client = _sessions.get(key)
+    if client is not None:
+        yield client
+        return
+
+    client = TradingClient(
+        base_url=config.web_api_url,
+        verify_ssl=config.web_api_verify_ssl,
+        timeout=config.web_api_timeout,
+        conid_cache_file=CONID_CACHE_FILE,
+    )
+    try:
+        connected = client.connect()
+    except BaseException:
+        client.disconnect()
+        raise
+
+    if connected:
+        atexit.register(client.disconnect)
+        _sessions[key] = client
+        yield client
+        return
+
+    try:
+        yield client
+    finally:
+        client.disconnect()
+
 
 def print_banner() -> None:
     """Print application banner"""
@@ -21,6 +74,41 @@ def print_banner() -> None:
     print()
 
 
+def _print_order_results(results: List[dict], trail_label: str) -> None:
+    """
+    Print order placement results followed by a success/failure summary
+
+    Rows are formatted in a single pass and written to stdout at once.
+
+    Args:
+        results: Order result dictionaries from TradingClient
+        trail_label: Label shown after the trailing percentage (e.g., "trail BUY")
+    """
+    lines = [f"\n{'=' * 80}", "Order Placement Results:", f"{'=' * 80}\n"]
+    success_count = 0
+
+    for result in results:
+        symbol = result.get("symbol")
+        if "orderId" in result:
+            lines.append(
+                f"  {symbol:6s}: Order ID {result['orderId']:4d}, "
+                f"{result['quantity']:2.0f} shares, "
+                f"{result['trailing_percent']:.1f}% {trail_label}, "
+                f"Status: {result['status']}"
+            )
+            success_count += 1
+        else:
+            lines.append(f"  {symbol:6s}: {result.get('error', 'Unknown error')}")
+
+    failed_count = len(results) - success_count
+    lines += [
+        f"\n{'=' * 80}",
+        f"Success: {success_count} | Failed: {failed_count}",
+        f"{'=' * 80}\n",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def place_trailing_stop_orders(
     config: Config,
     account: str,
@@ -44,15 +132,7 @@ def place_trailing_stop_orders(
     logger.info("Connecting to IBKR Web API...")
 
     # Connect to IBKR Web API
-    client = TradingClient(
-        base_url=config.web_api_url,
-        verify_ssl=config.web_api_verify_ssl,
-        timeout=config.web_api_timeout,
-    )
-
-    try:
-        client.connect()
-
+    with trading_session(config) as client:
         print(f"\n{'=' * 80}")
         print(f"Placing trailing stop orders for account {account}")
         print(f"Trailing stop percentage: {trailing_percent}%")
@@ -72,37 +152,11 @@ def place_trailing_stop_orders(
             return
 
         # Display results
-        print(f"\n{'=' * 80}")
-        print("Order Placement Results:")
-        print(f"{'=' * 80}\n")
-
-        success_count = 0
-        failed_count = 0
-
-        for result in results:
-            symbol = result.get("symbol")
-            if "orderId" in result:
-                print(
-                    f"  {symbol:6s}: Order ID {result['orderId']:4d}, "
-                    f"{result['quantity']:2.0f} shares, "
-                    f"{result['trailing_percent']:.1f}% trail, "
-                    f"Status: {result['status']}"
-                )
-                success_count += 1
-            else:
-                print(f"  {symbol:6s}: {result.get('error', 'Unknown error')}")
-                failed_count += 1
-
-        print(f"\n{'=' * 80}")
-        print(f"Success: {success_count} | Failed: {failed_count}")
-        print(f"{'=' * 80}\n")
+        _print_order_results(results, "trail")
 
         print("Note: Orders submitted to IB system will be monitored and executed automatically.")
         print("You can view and manage these orders in TWS/IB Gateway.")
 
-    finally:
-        client.disconnect()
-
 
 def place_trailing_stop_buy_orders(
     config: Config,
@@ -127,76 +181,34 @@ def place_trailing_stop_buy_orders(
     logger.info("Connecting to IBKR Web API...")
 
     # Connect to IBKR Web API
-    client = TradingClient(
-        base_url=config.web_api_url,
-        verify_ssl=config.web_api_verify_ssl,
-        timeout=config.web_api_timeout,
-    )
-
-    try:
-        client.connect()
-
+    with trading_session(config) as client:
         print(f"\n{'=' * 80}")
         print(f"Placing trailing stop BUY orders for account {account}")
         print(f"Trailing stop percentage: {trailing_percent}%")
         print(f"Symbols: {', '.join(symbols)}")
         print(f"{'=' * 80}\n")
 
-        # Place buy orders for each symbol with fixed quantity
-        results = []
-        for symbol in symbols:
-            try:
-                # Use a default quantity of 1 for buy orders
-                # User can modify the order in TWS/IB Gateway if needed
-                result = client.place_trailing_stop_order(
-                    symbol=symbol,
-                    quantity=1,
-                    trailing_percent=trailing_percent,
-                    action="BUY",
-                    account=account,
-                )
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to place order for {symbol}: {e}")
-                results.append({"symbol": symbol, "error": str(e), "status": "failed"})
+        # Place buy orders for all symbols at once with a default quantity of 1
+        # User can modify the orders in TWS/IB Gateway if needed
+        results = client.place_trailing_stop_orders_batch(
+            symbols=symbols,
+            quantity=1,
+            trailing_percent=trailing_percent,
+            action="BUY",
+            account=account,
+        )
 
         if not results:
             print("No orders placed")
             return
 
         # Display results
-        print(f"\n{'=' * 80}")
-        print("Order Placement Results:")
-        print(f"{'=' * 80}\n")
-
-        success_count = 0
-        failed_count = 0
-
-        for result in results:
-            symbol = result.get("symbol")
-            if "orderId" in result:
-                print(
-                    f"  {symbol:6s}: Order ID {result['orderId']:4d}, "
-                    f"{result['quantity']:2.0f} shares, "
-                    f"{result['trailing_percent']:.1f}% trail BUY, "
-                    f"Status: {result['status']}"
-                )
-                success_count += 1
-            else:
-                print(f"  {symbol:6s}: {result.get('error', 'Unknown error')}")
-                failed_count += 1
-
-        print(f"\n{'=' * 80}")
-        print(f"Success: {success_count} | Failed: {failed_count}")
-        print(f"{'=' * 80}\n")
+        _print_order_results(results, "trail BUY")
 
         print("Note: These are BUY orders with quantity=1 (default).")
         print("You can modify quantity in TWS/IB Gateway after placement.")
         print("Orders will execute when price rises by the trailing percentage.")
 
-    finally:
-        client.disconnect()
-
 
 def view_positions(
     config: Config,
@@ -217,15 +229,7 @@ def view_positions(
     logger.info("Connecting to IBKR Web API...")
 
     # Connect to IBKR Web API
-    client = TradingClient(
-        base_url=config.web_api_url,
-        verify_ssl=config.web_api_verify_ssl,
-        timeout=config.web_api_timeout,
-    )
-
-    try:
-        client.connect()
-
+    with trading_session(config) as client:
         print(f"\n{'=' * 80}")
         print(f"Positions for Account {account}")
         print(f"{'=' * 80}\n")
@@ -247,6 +251,8 @@ def view_positions(
 
         total_market_value = 0
         total_unrealized_pnl = 0
+        # Rows are collected and printed together rather than one print per position
+        rows = []
 
         for pos in positions:
             symbol = pos.get("symbol", "N/A")
@@ -262,11 +268,12 @@ def view_positions(
             # Color code P&L
             pnl_str = f"${unrealized_pnl:,.2f}"
 
-            print(
+            rows.append(
                 f"{symbol:<8} {quantity:<8.0f} ${avg_cost:<11,.2f} ${mkt_price:<11,.2f} "
                 f"${mkt_value:<13,.2f} {pnl_str:<14}"
             )
 
+        print("\n".join(rows))
         print("-" * 80)
         print(
             f"{'TOTAL':<8} {'':<8} {'':<12} {'':<12} "
@@ -275,9 +282,6 @@ def view_positions(
         print("-" * 80)
         print(f"\nTotal: {len(positions)} positions")
 
-    finally:
-        client.disconnect()
-
 
 def view_open_orders(
     config: Config,
@@ -298,15 +302,7 @@ def view_open_orders(
     logger.info("Connecting to IBKR Web API...")
 
     # Connect to IBKR Web API
-    client = TradingClient(
-        base_url=config.web_api_url,
-        verify_ssl=config.web_api_verify_ssl,
-        timeout=config.web_api_timeout,
-    )
-
-    try:
-        client.connect()
-
+    with trading_session(config) as client:
         print(f"\n{'=' * 80}")
         if account:
             print(f"Active Orders for Account {account}:")
@@ -322,12 +318,9 @@ def view_open_orders(
             return
 
         # Group by account
-        accounts = {}
+        accounts = defaultdict(list)
         for order in orders:
-            acc = order.get("account", "Unknown")
-            if acc not in accounts:
-                accounts[acc] = []
-            accounts[acc].append(order)
+            accounts[order.get("account", "Unknown")].append(order)
 
         # Display orders
         for acc, order_list in sorted(accounts.items()):
@@ -339,6 +332,8 @@ def view_open_orders(
             )
             print("-" * 80)
 
+            # Rows are collected and printed together rather than one print per order
+            rows = []
             for order in order_list:
                 order_id = order.get("orderId", "N/A")
                 # Web API uses "ticker" instead of "symbol"
@@ -362,16 +357,14 @@ def view_open_orders(
                 else:
                     type_info = "-"
 
-                print(
+                rows.append(
                     f"{order_id:<8} {symbol:<8} {action:<6} {quantity:<6.0f} "
                     f"{order_type:<8} {type_info:<12} {status:<15}"
                 )
+            print("\n".join(rows))
 
         print(f"\nTotal: {len(orders)} active orders")
 
-    finally:
-        client.disconnect()
-
 
 def cancel_trailing_stop_orders(
     config: Config,
@@ -412,15 +405,7 @@ def cancel_trailing_stop_orders(
     logger.info("Connecting to IBKR Web API...")
 
     # Connect to IBKR Web API
-    client = TradingClient(
-        base_url=config.web_api_url,
-        verify_ssl=config.web_api_verify_ssl,
-        timeout=config.web_api_timeout,
-    )
-
-    try:
-        client.connect()
-
+    with trading_session(config) as client:
         print(f"\n{'=' * 80}")
         print("Cancel Trailing Stop Orders")
         print(f"{'=' * 80}\n")
@@ -432,26 +417,16 @@ def cancel_trailing_stop_orders(
             cancelled_count = 0
             failed_count = 0
 
-            # First, get all orders to find which account each order belongs to
-            all_orders = client.get_open_orders()
-            order_account_map = {
-                order.get("orderId"): order.get("account", "") for order in all_orders
-            }
-
-            for order_id in order_ids:
-                # Find the account for this order
-                order_account = order_account_map.get(order_id)
-                if not order_account:
+            for result in client.cancel_orders(order_ids):
+                order_id = result["orderId"]
+                if result["status"] == "cancelled":
+                    print(f"  Order {order_id} (Account: {result['account']}) cancelled")
+                    cancelled_count += 1
+                elif "account" not in result:
                     print(f"  Order {order_id} not found or no account info")
                     failed_count += 1
-                    continue
-
-                try:
-                    client.cancel_order(order_account, order_id)
-                    print(f"  Order {order_id} (Account: {order_account}) cancelled")
-                    cancelled_count += 1
-                except Exception as e:
-                    print(f"  Order {order_id} cancellation failed: {e}")
+                else:
+                    print(f"  Order {order_id} cancellation failed: {result['error']}")
                     failed_count += 1
 
             print(f"\n{'=' * 80}")
@@ -497,9 +472,6 @@ def cancel_trailing_stop_orders(
             print(f"Success: {cancelled_count} | Failed: {failed_count}")
             print(f"{'=' * 80}")
 
-    finally:
-        client.disconnect()
-
 
 def parse_args() -> argparse.Namespace:
     """
@@ -565,6 +537,7 @@ Note:
     place_parser.add_argument(
         "--symbols",
         nargs="+",
+        default=None,
         help="Specific symbols (if not specified, all positions in account)",
     )
 
@@ -592,7 +565,7 @@ Note:
 
     # Orders command - view open orders
     orders_parser = subparsers.add_parser("orders", help="View active orders")
-    orders_parser.add_argument("--account", help="Filter by account (optional)")
+    orders_parser.add_argument("--account", default=None, help="Filter by account (optional)")
 
     # Cancel command - cancel orders
     cancel_parser = subparsers.add_parser("cancel", help="Cancel trailing stop orders")
@@ -602,19 +575,29 @@ Note:
         type=int,
         help="Order IDs (if not specified, use --account filter)",
     )
-    cancel_parser.add_argument("--account", help="Cancel all trailing stop orders for this account")
+    cancel_parser.add_argument(
+        "--account", default=None, help="Cancel all trailing stop orders for this account"
+    )
     cancel_parser.add_argument(
         "--symbols",
         nargs="+",
+        default=None,
         help="Cancel only orders for these symbols (requires --account)",
     )
 
     return parser.parse_args()
 
 
-def main() -> None:
-    """Main execution function"""
-    args = parse_args()
+def main(args: Optional[argparse.Namespace] = None) -> None:
+    """
+    Main execution function
+
+    Args:
+        args: Arguments already parsed by the ibkr-toolkit entry point (parsed from
+            the command line when omitted)
+    """
+    if args is None:
+        args = parse_args()
 
     if not args.command:
         print("Error: Please specify a subcommand (place, place-buy, orders, cancel)")
@@ -630,10 +613,10 @@ def main() -> None:
         # Load configuration
         logger.info("Loading configuration...")
         try:
-            config = Config()
+            config = load_config()
             logger.info("Configuration loaded successfully")
         except ConfigurationError as e:
-            logger.error(f"Configuration error: {e}")
+            logger.error("Configuration error: %s", e)
             print("\nPlease check .env file or environment variables")
             print("Required variables:")
             print("  - IBKR_FLEX_TOKEN")
@@ -666,17 +649,15 @@ def main() -> None:
         elif args.command == "orders":
             view_open_orders(
                 config=config,
-                account=args.account if hasattr(args, "account") else None,
+                account=args.account,
                 logger=logger,
             )
         elif args.command == "cancel":
             cancel_trailing_stop_orders(
                 config=config,
                 order_ids=args.order_ids if args.order_ids else None,
-                account=args.account if hasattr(args, "account") else None,
-                symbols=[s.upper() for s in args.symbols]
-                if hasattr(args, "symbols") and args.symbols
-                else None,
+                account=args.account,
+                symbols=[s.upper() for s in args.symbols] if args.symbols else None,
                 logger=logger,
             )
 
@@ -689,7 +670,7 @@ def main() -> None:
         print("\n\nOperation cancelled by user")
         sys.exit(0)
     except APIError as e:
-        logger.error(f"API error: {e}")
+        logger.error("API error: %s", e)
         print(f"\nAPI error: {e}")
         print("\nPlease check:")
         print("  1. TWS or IB Gateway is running")
@@ -697,11 +678,11 @@ def main() -> None:
         print("  3. Port number is correct")
         sys.exit(1)
     except IBKRTaxError as e:
-        logger.error(f"Application error: {e}", exc_info=True)
+        logger.error("Application error: %s", e, exc_info=True)
         print(f"\nError: {e}")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         print(f"\nUnexpected error: {e}")
         print("\nSee logs for detailed error information")
         sys.exit(1)
@@ -5,10 +5,13 @@ Logging configuration for IBKR Tax Tool
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from ..constants import DEFAULT_LOG_LEVEL, LOG_DATE_FORMAT, LOG_FORMAT
 
+# Handler configuration applied to each logger name, used to skip redundant rebuilds
+_configured: Dict[str, Tuple[str, Optional[str], bool]] = {}
+
 
 def setup_logger(
     name: str,
@@ -19,6 +22,9 @@ def setup_logger(
     """
     Setup logger with console and/or file handlers
 
+    Repeated calls with the same arguments return the already configured logger
+    without rebuilding its handlers.
+
     Args:
         name: Logger name
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -28,11 +34,20 @@ def setup_logger(
     Returns:
         Configured logger instance
     """
+    level = level or DEFAULT_LOG_LEVEL
+    key = (level, log_file, console)
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level or DEFAULT_LOG_LEVEL))
 
-    # Remove existing handlers
-    logger.handlers.clear()
+    # Reuse existing handlers if this logger is already configured identically
+    if _configured.get(name) == key and logger.handlers:
+        return logger
+
+    logger.setLevel(getattr(logging, level))
+
+    # Remove existing handlers (closing any open log files)
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
 
     # Create formatter
     formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
@@ -51,6 +66,7 @@ def setup_logger(
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
+    _configured[name] = key
     return logger
 
 
@@ -12,10 +12,9 @@ Provides commands for:
 import argparse
 import json
 import sys
-import time
 
 from .api.web_client import WebAPIClient, WebAPIError
-from .config import Config
+from .config import Config, load_config
 from .utils.logging import setup_logger
 
 logger = setup_logger("ibkr_toolkit.web_cli", level="INFO", console=True)
@@ -74,6 +73,8 @@ def account_info_command(config: Config, output_format: str = "table"):
     except WebAPIError as e:
         logger.error(f"Web API Error: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def positions_command(config: Config, account_id: str, output_format: str = "table"):
@@ -146,6 +147,8 @@ def positions_command(config: Config, account_id: str, output_format: str = "tab
     except WebAPIError as e:
         logger.error(f"Web API Error: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def summary_command(config: Config, account_id: str, output_format: str = "table"):
@@ -195,6 +198,8 @@ def summary_command(config: Config, account_id: str, output_format: str = "table
     except WebAPIError as e:
         logger.error(f"Web API Error: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def orders_command(config: Config, account_id: str, output_format: str = "table"):
@@ -261,6 +266,8 @@ def orders_command(config: Config, account_id: str, output_format: str = "table"
     except WebAPIError as e:
         logger.error(f"Web API Error: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def search_command(config: Config, symbol: str, output_format: str = "table"):
@@ -305,6 +312,8 @@ def search_command(config: Config, symbol: str, output_format: str = "table"):
     except WebAPIError as e:
         logger.error(f"Web API Error: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def snapshot_command(config: Config, conids: str, output_format: str = "table"):
@@ -326,12 +335,8 @@ def snapshot_command(config: Config, conids: str, output_format: str = "table"):
         # Parse contract IDs
         conid_list = [int(c.strip()) for c in conids.split(",")]
 
-        # First call to initialize
-        client.get_market_snapshot(conid_list)
-
-        # Wait and get actual data
-        time.sleep(1)
-        snapshot = client.get_market_snapshot(conid_list)
+        # The first call initializes the data stream; poll until prices arrive
+        snapshot = client.get_market_snapshot(conid_list, wait=True) or []
 
         if output_format == "json":
             display_json(snapshot)
@@ -369,6 +374,8 @@ def snapshot_command(config: Config, conids: str, output_format: str = "table"):
     except ValueError as e:
         logger.error(f"Invalid contract IDs: {e}")
         return 1
+    finally:
+        client.close()
 
 
 def main():
@@ -425,7 +432,7 @@ def main():
         return 1
 
     # Load configuration
-    config = Config()
+    config = load_config()
 
     # Execute command
     try:
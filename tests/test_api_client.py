@@ -8,6 +8,7 @@ import pytest
 import requests
 
 from ibkr_toolkit.api.flex_query import FlexQueryClient
+from ibkr_toolkit.constants import MAX_RETRIES
 from ibkr_toolkit.exceptions import APIError
 
 
@@ -234,8 +235,41 @@ def test_fetch_data_complete_workflow(mock_sleep, mock_get_report, mock_request_
 
     assert result == {"@accountId": "U123"}
     mock_request_report.assert_called_once_with(from_date="20250101", to_date="20250131")
-    mock_get_report.assert_called_once_with("REF123")
-    mock_sleep.assert_called_once_with(2)
+    mock_get_report.assert_called_once_with("REF123", max_retries=MAX_RETRIES + 1)
+    mock_sleep.assert_not_called()
+
+
+@patch("ibkr_toolkit.api.flex_query.FlexQueryClient.request_report")
+@patch("ibkr_toolkit.api.flex_query.requests.get")
+@patch("ibkr_toolkit.api.flex_query.xmltodict.parse")
+@patch("ibkr_toolkit.api.flex_query.time.sleep")
+def test_fetch_data_waits_for_report_ready_on_fourth_poll(
+    mock_sleep, mock_parse, mock_get, mock_request_report
+):
+    """Test fetch_data polls as long as the former upfront wait plus retries did"""
+    mock_request_report.return_value = "REF123"
+    mock_get.return_value = Mock(status_code=200, content=b"<xml>test</xml>")
+    not_ready = {
+        "FlexStatementResponse": {
+            "Status": "Fail",
+            "ErrorMessage": "Statement is not yet ready",
+        }
+    }
+    mock_parse.side_effect = [not_ready] * 3 + [
+        {
+            "FlexStatementResponse": {
+                "Status": "Success",
+                "FlexStatements": {"FlexStatement": {"@accountId": "U123"}},
+            }
+        }
+    ]
+
+    client = FlexQueryClient("test_token", "test_query")
+    result = client.fetch_data()
+
+    assert result == {"@accountId": "U123"}
+    assert mock_get.call_count == 4
+    assert mock_sleep.call_count == 3
 
 
 def test_save_raw_data_success(tmp_path):
@@ -2,6 +2,7 @@
 Tests for CLI module
 """
 
+import argparse
 from unittest.mock import patch
 
 import pandas as pd
@@ -12,6 +13,7 @@ from ibkr_toolkit.cli import (
     _format_column_names,
     _sort_by_date_time,
     export_to_excel,
+    main,
 )
 
 
@@ -240,3 +242,15 @@ def test_export_to_excel_io_error(mock_writer):
             performance,
             "test_output.xlsx",
         )
+
+
+@patch("ibkr_toolkit.cli.parse_args")
+def test_main_uses_pre_parsed_arguments(mock_parse_args):
+    """Test main accepts arguments parsed by the entry point without re-parsing"""
+    args = argparse.Namespace(year=2024, from_year=2020, all=False)
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(args)
+
+    assert exc_info.value.code == 1
+    mock_parse_args.assert_not_called()
@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 import pytest
 
-from ibkr_toolkit.config import Config
+from ibkr_toolkit.config import Config, load_config
 from ibkr_toolkit.exceptions import ConfigurationError
 
 
@@ -61,3 +61,25 @@ def test_config_invalid_exchange_rate(mock_env, monkeypatch):
 
     config = Config()
     assert config.exchange_rate == 7.2  # Falls back to default
+
+
+def test_config_reads_environment_once(mock_env, monkeypatch):
+    """Test settings are cached on first access"""
+    monkeypatch.setenv("IBKR_WEB_API_TIMEOUT", "15")
+    config = Config()
+    assert config.web_api_timeout == 15
+
+    monkeypatch.setenv("IBKR_WEB_API_TIMEOUT", "60")
+    assert config.web_api_timeout == 15
+
+
+def test_load_config_returns_shared_instance(monkeypatch):
+    """Test load_config reuses one Config per env file"""
+    monkeypatch.setenv("IBKR_FLEX_TOKEN", "token")
+    monkeypatch.setenv("IBKR_QUERY_ID", "123")
+    load_config.cache_clear()
+
+    try:
+        assert load_config() is load_config()
+    finally:
+        load_config.cache_clear()
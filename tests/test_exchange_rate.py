@@ -118,7 +118,24 @@ def test_get_rate_uses_default_when_api_fails(mock_get, tmp_path):
     rate = service.get_rate("2025-01-01", default_rate=7.2)
 
     assert rate == 7.2
-    assert service.cache["2025-01-01"] == 7.2
+    assert "2025-01-01" not in service.cache
+    assert not cache_file.exists()
+
+
+@patch("ibkr_toolkit.services.exchange_rate.requests.get")
+def test_get_rate_does_not_retry_failed_date_in_same_run(mock_get, tmp_path):
+    """Test a failed date falls back to default without hitting the API again"""
+    cache_file = tmp_path / "cache.json"
+    service = ExchangeRateService(str(cache_file))
+
+    mock_get.side_effect = requests.RequestException("Network error")
+
+    service.get_rate("2025-01-01", default_rate=7.2)
+    call_count = mock_get.call_count
+    rate = service.get_rate("20250101", default_rate=7.1)
+
+    assert rate == 7.1
+    assert mock_get.call_count == call_count
 
 
 @patch("ibkr_toolkit.services.exchange_rate.requests.get")
@@ -294,3 +311,11 @@ def test_get_exchange_rate_service_singleton():
     service2 = get_exchange_rate_service()
 
     assert service1 is service2
+
+
+def test_parse_cny_rate_rejects_malformed_payload():
+    """Test rate parsing ignores payloads without a CNY rate"""
+    assert ExchangeRateService._parse_cny_rate({"rates": {"CNY": "7.1"}}) == 7.1
+    assert ExchangeRateService._parse_cny_rate({"rates": {"EUR": 0.9}}) is None
+    assert ExchangeRateService._parse_cny_rate({"rates": None}) is None
+    assert ExchangeRateService._parse_cny_rate([]) is None
@@ -0,0 +1,39 @@
+"""
+Tests for logging utilities
+"""
+
+from ibkr_toolkit.utils.logging import setup_logger
+
+
+def test_setup_logger_reuses_handlers():
+    """Test repeated setup with same arguments keeps existing handlers"""
+    logger = setup_logger("test_logging.reuse", level="INFO")
+    handlers = list(logger.handlers)
+
+    again = setup_logger("test_logging.reuse", level="INFO")
+
+    assert again is logger
+    assert again.handlers == handlers
+    assert len(again.handlers) == 1
+
+
+def test_setup_logger_reconfigures_on_change(tmp_path):
+    """Test setup with different arguments rebuilds handlers"""
+    log_file = tmp_path / "app.log"
+    logger = setup_logger("test_logging.change", level="INFO")
+
+    logger = setup_logger("test_logging.change", level="DEBUG", log_file=str(log_file))
+
+    assert logger.level == 10
+    assert len(logger.handlers) == 2
+    assert log_file.exists()
+
+
+def test_setup_logger_restores_cleared_handlers():
+    """Test setup rebuilds handlers removed outside of setup_logger"""
+    logger = setup_logger("test_logging.cleared", level="INFO")
+    logger.handlers.clear()
+
+    logger = setup_logger("test_logging.cleared", level="INFO")
+
+    assert len(logger.handlers) == 1
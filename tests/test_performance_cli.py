@@ -0,0 +1,51 @@
+"""
+Tests for performance CLI display helpers
+"""
+
+import io
+
+from ibkr_toolkit.performance_cli import _display_performance_table, _display_returns_summary
+
+
+def test_returns_summary_reports_best_and_worst_dates(capsys):
+    """Test best and worst returns are shown with their dates"""
+    account_data = {"id": "U123", "returns": [0.01, 0.05, -0.02, 0.05, -0.02]}
+    dates = ["20250101", "20250102", "20250103", "20250104", "20250105"]
+
+    _display_returns_summary(account_data, dates)
+
+    output = capsys.readouterr().out
+    assert "Latest Return (20250105):  -2.00%" in output
+    assert "Best Return  (20250102):  +5.00%" in output
+    assert "Worst Return (20250103):  -2.00%" in output
+
+
+def test_performance_table_writes_report_for_requested_accounts(capsys):
+    """Test the buffered report covers only the requested accounts"""
+    data = {
+        "tpps": {
+            "dates": ["202501", "202502"],
+            "data": [
+                {"id": "U1", "returns": [0.01, 0.02]},
+                {"id": "U2", "returns": [0.03, 0.04]},
+            ],
+        }
+    }
+
+    _display_performance_table(data, ["U1"], "1M")
+
+    output = capsys.readouterr().out
+    assert output.startswith("=" * 80 + "\nAccount Performance - 1M\n")
+    assert "Period Returns - U1" in output
+    assert "  2025-02:  +2.00%" in output
+    assert "U2" not in output
+
+
+def test_report_helpers_write_to_given_stream(capsys):
+    """Test report sections are written to the passed buffer, not sys.stdout"""
+    buf = io.StringIO()
+
+    _display_returns_summary({"id": "U1", "returns": [0.01]}, ["20250101"], buf)
+
+    assert "Cumulative Returns - U1" in buf.getvalue()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,101 @@
+"""
+Tests for stop-loss CLI module
+"""
+
+from contextlib import nullcontext
+from unittest.mock import Mock, patch
+
+from ibkr_toolkit import stop_loss_cli
+
+
+@patch("ibkr_toolkit.stop_loss_cli.atexit.register")
+@patch("ibkr_toolkit.stop_loss_cli.TradingClient")
+def test_trading_session_reuses_connected_client(mock_client_cls, mock_register):
+    """Test commands in one process share a single connected client"""
+    config = Mock(web_api_url="https://gw/v1/api", web_api_verify_ssl=False, web_api_timeout=30)
+
+    with patch.dict(stop_loss_cli._sessions, clear=True):
+        with stop_loss_cli.trading_session(config) as first:
+            pass
+        with stop_loss_cli.trading_session(config) as second:
+            pass
+
+    assert first is second
+    mock_client_cls.return_value.connect.assert_called_once()
+    mock_register.assert_called_once_with(mock_client_cls.return_value.disconnect)
+
+
+@patch("ibkr_toolkit.stop_loss_cli.atexit.register")
+@patch("ibkr_toolkit.stop_loss_cli.TradingClient")
+def test_trading_session_retries_after_failed_connect(mock_client_cls, mock_register):
+    """Test a client that failed to authenticate is not reused by later commands"""
+    config = Mock(web_api_url="https://gw/v1/api", web_api_verify_ssl=False, web_api_timeout=30)
+    mock_client_cls.return_value.connect.side_effect = [False, True]
+
+    with patch.dict(stop_loss_cli._sessions, clear=True):
+        with stop_loss_cli.trading_session(config):
+            pass
+        mock_client_cls.return_value.disconnect.assert_called_once()
+        assert stop_loss_cli._sessions == {}
+        with stop_loss_cli.trading_session(config):
+            pass
+
+    assert mock_client_cls.return_value.connect.call_count == 2
+    mock_register.assert_called_once_with(mock_client_cls.return_value.disconnect)
+
+
+def test_print_order_results_lists_rows_and_summary(capsys):
+    """Test order results are printed with a success/failure summary"""
+    results = [
+        {
+            "orderId": 12,
+            "symbol": "AAPL",
+            "quantity": 10,
+            "trailing_percent": 5.0,
+            "status": "Submitted",
+        },
+        {"symbol": "NOPE", "error": "Contract not found", "status": "failed"},
+    ]
+
+    stop_loss_cli._print_order_results(results, "trail")
+
+    output = capsys.readouterr().out
+    assert "  AAPL  : Order ID   12, 10 shares, 5.0% trail, Status: Submitted" in output
+    assert "  NOPE  : Contract not found" in output
+    assert "Success: 1 | Failed: 1" in output
+
+
+def test_view_open_orders_groups_rows_by_account(capsys):
+    """Test open orders are listed under their accounts in account order"""
+    client = Mock()
+    client.get_open_orders.return_value = [
+        {
+            "orderId": 2,
+            "account": "U2",
+            "ticker": "MSFT",
+            "side": "SELL",
+            "totalSize": 5,
+            "orderType": "STP",
+            "auxPrice": 300.0,
+            "status": "Submitted",
+        },
+        {
+            "orderId": 1,
+            "account": "U1",
+            "ticker": "AAPL",
+            "side": "SELL",
+            "totalSize": 10,
+            "orderType": "TRAIL",
+            "trailingPercent": 5.0,
+            "status": "Submitted",
+        },
+    ]
+
+    with patch.object(stop_loss_cli, "trading_session", return_value=nullcontext(client)):
+        stop_loss_cli.view_open_orders(Mock(), logger=Mock())
+
+    output = capsys.readouterr().out
+    assert output.index("Account: U1") < output.index("Account: U2")
+    assert "1        AAPL     SELL   10     TRAIL    5.0%" in output
+    assert "2        MSFT     SELL   5      STP      $300.00" in output
+    assert "Total: 2 active orders" in output
@@ -0,0 +1,556 @@
+"""
+Tests for Web API trading client
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ibkr_toolkit.api.trading_client import TradingClient
+from ibkr_toolkit.api.web_client import WebAPIError
+
+
+@pytest.fixture
+def client():
+    """Trading client with a mocked Web API client"""
+    trading_client = TradingClient()
+    trading_client.client = Mock()
+    return trading_client
+
+
+def test_get_market_prices_single_snapshot(client):
+    """Test prices for several symbols come from one snapshot request"""
+    conids = {"AAPL": [{"conid": 265598}], "TSLA": [{"conid": "76792991"}], "XXX": []}
+    client.client.search_contract.side_effect = lambda symbol: conids[symbol]
+    client.client.get_market_snapshot.return_value = [
+        {"conid": 265598, "31": "150.25"},
+        {"conid": 76792991, "31": "210.5"},
+    ]
+
+    prices = client.get_market_prices(["AAPL", "TSLA", "XXX", "AAPL"])
+
+    assert prices == {"AAPL": 150.25, "TSLA": 210.5, "XXX": None}
+    assert client.client.search_contract.call_count == 3
+    client.client.get_market_snapshot.assert_called_once()
+    assert sorted(client.client.get_market_snapshot.call_args[0][0]) == [265598, 76792991]
+
+
+def test_get_market_prices_fills_aliases_of_one_contract(client):
+    """Test symbols resolving to the same contract all receive its price"""
+    client.client.search_contract.return_value = [{"conid": 72063691}]
+    client.client.get_market_snapshot.return_value = [{"conid": 72063691, "31": "410.5"}]
+
+    prices = client.get_market_prices(["BRK B", "BRK.B"])
+
+    assert prices == {"BRK B": 410.5, "BRK.B": 410.5}
+    assert client.client.get_market_snapshot.call_args[0][0] == [72063691]
+
+
+@patch("ibkr_toolkit.api.trading_client.ThreadPoolExecutor")
+def test_map_concurrently_skips_pool_for_single_item(mock_executor):
+    """Test a single item is processed inline without starting worker threads"""
+    assert TradingClient._map_concurrently(str, [1]) == ["1"]
+    assert TradingClient._map_concurrently(str, []) == []
+    mock_executor.assert_not_called()
+
+
+def test_get_market_prices_empty(client):
+    """Test no requests are made for an empty symbol list"""
+    assert client.get_market_prices([]) == {}
+    client.client.search_contract.assert_not_called()
+
+
+def test_snapshot_polls_with_configured_timing():
+    """Test snapshots wait for prices using the constructor's timeout and poll interval"""
+    client = TradingClient(market_data_timeout=10.0, poll_interval=0.25)
+    client.client = Mock()
+    client.client.get_market_snapshot.return_value = [{"conid": 1, "31": "5"}]
+
+    assert client._get_snapshot([1]) == [{"conid": 1, "31": "5"}]
+
+    client.client.get_market_snapshot.assert_called_once_with(
+        [1], wait=True, timeout=10.0, poll_interval=0.25
+    )
+
+
+def test_market_price_cache_reuses_recent_prices(client):
+    """Test cached prices skip the API until invalidated"""
+    client.client.search_contract.return_value = [{"conid": 265598}]
+    client.client.get_market_snapshot.return_value = [{"conid": 265598, "31": "150.25"}]
+
+    assert client.get_market_price("AAPL") == 150.25
+    assert client.get_market_prices(["AAPL"]) == {"AAPL": 150.25}
+    assert client.client.get_market_snapshot.call_count == 1
+
+    client.invalidate_cache("AAPL")
+    client.get_market_price("AAPL")
+
+    assert client.client.get_market_snapshot.call_count == 2
+
+
+def test_market_price_cache_disabled(client):
+    """Test price_ttl of 0 disables caching"""
+    client.price_ttl = 0
+    client.client.search_contract.return_value = [{"conid": 265598}]
+    client.client.get_market_snapshot.return_value = [{"conid": 265598, "31": "150.25"}]
+
+    client.get_market_price("AAPL")
+    client.get_market_price("AAPL")
+
+    assert client.client.get_market_snapshot.call_count == 2
+
+
+def test_place_trailing_stop_for_positions_resolves_contracts_once(client):
+    """Test contracts are resolved in one batch and not searched again per order"""
+    client.client.get_positions.return_value = [
+        {"contractDesc": "AAPL", "position": 10},
+        {"contractDesc": "TSLA", "position": 0},
+        {"contractDesc": "XXX", "position": 5},
+    ]
+    conids = {"AAPL": [{"conid": 265598}], "XXX": []}
+    client.client.search_contract.side_effect = lambda symbol: conids[symbol]
+    client.client.place_order.return_value = [{"order_id": 101}]
+
+    results = client.place_trailing_stop_for_positions("U123", 5.0)
+
+    assert client.client.search_contract.call_count == 2
+    assert results[0]["orderId"] == 101
+    assert results[1] == {"symbol": "XXX", "error": "Contract not found", "status": "failed"}
+    payload = client.client.place_order.call_args[0][1][0]
+    assert payload["conid"] == 265598
+    assert payload["auxPrice"] == 5.0
+
+
+def test_place_trailing_stop_for_positions_uses_position_conids(client):
+    """Test contract IDs reported with positions skip the contract search"""
+    client.client.get_positions.return_value = [
+        {"contractDesc": "AAPL", "position": 10, "conid": 265598}
+    ]
+    client.client.place_order.return_value = [{"order_id": 101}]
+
+    results = client.place_trailing_stop_for_positions("U123", 5.0)
+
+    assert results[0]["orderId"] == 101
+    client.client.search_contract.assert_not_called()
+    assert client.client.place_order.call_args[0][1][0]["conid"] == 265598
+
+
+def test_place_trailing_stop_for_positions_keeps_position_order(client):
+    """Test concurrently placed orders are reported in position order"""
+    client.client.get_positions.return_value = [
+        {"contractDesc": symbol, "position": 1} for symbol in ("AAPL", "MSFT", "NVDA")
+    ]
+    client.client.search_contract.side_effect = lambda symbol: [{"conid": len(symbol)}]
+
+    def place_order(account, payloads):
+        if payloads[0]["conid"] == 4:
+            time.sleep(0.05)
+        return [{"order_id": payloads[0]["conid"] * 100}]
+
+    client.client.place_order.side_effect = place_order
+
+    results = client.place_trailing_stop_for_positions("U123", 5.0, symbols=["AAPL", "NVDA"])
+
+    assert [r["symbol"] for r in results] == ["AAPL", "NVDA"]
+    assert client.client.place_order.call_count == 2
+
+
+def test_cancel_orders_uses_single_order_snapshot(client):
+    """Test cancelling by ID looks up accounts from one open orders snapshot"""
+    client.client.get_accounts.return_value = [{"id": "U1"}, {"id": "U2"}]
+    client.client.get_live_orders.side_effect = lambda account_id: {
+        "orders": [
+            {"orderId": 11 if account_id == "U1" else 22, "account": account_id, "ticker": "AAPL"}
+        ]
+    }
+
+    results = client.cancel_orders([11, 22, 33])
+
+    assert [r["status"] for r in results] == ["cancelled", "cancelled", "failed"]
+    assert results[1]["account"] == "U2"
+    assert "account" not in results[2]
+    assert client.client.get_accounts.call_count == 1
+    client.client.cancel_order.assert_any_call("U1", 11)
+    client.client.cancel_order.assert_any_call("U2", 22)
+
+
+def test_order_index_reused_until_invalidated(client):
+    """Test the order index is cached and dropped after a cancellation"""
+    client.client.get_live_orders.return_value = [{"orderId": 11, "account": "U1"}]
+    client.client.get_accounts.return_value = [{"id": "U1"}]
+
+    client._get_order_index()
+    client._get_order_index()
+    assert client.client.get_live_orders.call_count == 1
+
+    client.cancel_order("U1", 11)
+    client._get_order_index()
+    assert client.client.get_live_orders.call_count == 2
+
+
+def test_cancel_orders_by_account_filters_and_reports(client):
+    """Test filtered orders are cancelled and failures are reported per order"""
+    client.client.get_live_orders.return_value = {
+        "orders": [
+            {"orderId": 1, "ticker": "AAPL", "orderType": "TRAIL"},
+            {"orderId": 2, "ticker": "TSLA", "orderType": "TRAIL"},
+            {"orderId": 3, "ticker": "AAPL", "orderType": "LMT"},
+            {"orderId": 4, "ticker": "AAPL", "orderType": "TRAIL"},
+        ]
+    }
+
+    def cancel_order(account, order_id):
+        if order_id == 4:
+            raise WebAPIError("rejected")
+        return {}
+
+    client.client.cancel_order.side_effect = cancel_order
+
+    results = client.cancel_orders_by_account("U1", symbols=["AAPL"], order_type="TRAIL")
+
+    assert [(r["orderId"], r["status"]) for r in results] == [(1, "cancelled"), (4, "failed")]
+    assert results[1]["error"] == "rejected"
+
+
+def test_parse_price_handles_snapshot_prefixes():
+    """Test snapshot price parsing strips close/halted markers"""
+    assert TradingClient._parse_price("150.25") == 150.25
+    assert TradingClient._parse_price("C149.80") == 149.8
+    assert TradingClient._parse_price("H12") == 12.0
+    assert TradingClient._parse_price(151.5) == 151.5
+    assert TradingClient._parse_price("") is None
+    assert TradingClient._parse_price(None) is None
+    assert TradingClient._parse_price("N/A") is None
+    assert TradingClient._parse_price("nan") is None
+    assert TradingClient._parse_price(float("nan")) is None
+
+
+def test_async_variants_fan_out(client):
+    """Test async variants can be gathered from an event loop"""
+    client.client.search_contract.side_effect = lambda symbol: [{"conid": len(symbol)}]
+    client.client.get_market_snapshot.side_effect = lambda conids, **kwargs: [
+        {"conid": conids[0], "31": str(conids[0] * 10)}
+    ]
+
+    async def fetch():
+        return await asyncio.gather(
+            client.get_market_price_async("AAPL"), client.get_market_price_async("MU")
+        )
+
+    assert asyncio.run(fetch()) == [40.0, 20.0]
+
+
+def test_concurrent_price_requests_are_coalesced(client):
+    """Test concurrent lookups of one symbol share a single API request"""
+    release = threading.Event()
+
+    def search_contract(symbol):
+        release.wait(timeout=5)
+        return [{"conid": 265598}]
+
+    client.client.search_contract.side_effect = search_contract
+    client.client.get_market_snapshot.return_value = [{"conid": 265598, "31": "150.25"}]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(client.get_market_price, "AAPL") for _ in range(4)]
+        while client.client.search_contract.call_count == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        prices = [f.result() for f in futures]
+
+    assert prices == [150.25] * 4
+    assert client.client.search_contract.call_count == 1
+    assert client._inflight == {}
+
+
+def test_coalesce_propagates_errors(client):
+    """Test errors from the shared lookup reach the caller and clear in-flight state"""
+    client.client.search_contract.side_effect = WebAPIError("boom")
+
+    with pytest.raises(WebAPIError):
+        client.get_market_price("AAPL")
+    assert client._inflight == {}
+
+
+def test_market_data_subscriptions_are_capped(client):
+    """Test least recently used market data streams are unsubscribed beyond the cap"""
+    client.client.get_market_snapshot.side_effect = lambda conids, **kwargs: [
+        {"conid": c, "31": "1"} for c in conids
+    ]
+
+    with patch("ibkr_toolkit.api.trading_client.MARKET_DATA_MAX_SUBSCRIPTIONS", 2):
+        client._get_snapshot([1])
+        client._get_snapshot([2])
+        client._get_snapshot([1])
+        client._get_snapshot([3])
+
+    client.client.unsubscribe_market_data.assert_called_once_with(2)
+    assert list(client._subscriptions) == [1, 3]
+
+
+def test_disconnect_closes_subscriptions(client):
+    """Test disconnect releases open market data streams"""
+    client.client.get_market_snapshot.return_value = [{"conid": 1, "31": "1"}]
+    client._get_snapshot([1])
+
+    client.disconnect()
+    client.disconnect()
+
+    client.client.unsubscribe_all_market_data.assert_called_once()
+    assert not client._subscriptions
+
+
+def test_cancel_orders_by_account_drops_order_index_once(client):
+    """Test batch cancellation calls the API directly and drops the order index"""
+    client.client.get_live_orders.return_value = {
+        "orders": [{"orderId": 1, "ticker": "AAPL"}, {"orderId": 2, "ticker": "MSFT"}]
+    }
+    client._order_index = (time.monotonic(), {})
+
+    with patch.object(client, "cancel_order") as cancel_order:
+        results = client.cancel_orders_by_account("U123")
+
+    cancel_order.assert_not_called()
+    assert client.client.cancel_order.call_count == 2
+    assert [r["status"] for r in results] == ["cancelled", "cancelled"]
+    assert client._order_index is None
+
+
+def test_contract_ids_are_cached(client):
+    """Test repeated lookups of a symbol search for its contract only once"""
+    client.price_ttl = 0
+    client.client.search_contract.return_value = [{"conid": "265598"}]
+    client.client.get_market_snapshot.return_value = [{"conid": 265598, "31": "150.25"}]
+
+    assert client.get_market_price("AAPL") == 150.25
+    assert client.get_market_price("AAPL") == 150.25
+    assert client.get_market_prices(["AAPL"]) == {"AAPL": 150.25}
+
+    client.client.search_contract.assert_called_once_with("AAPL")
+
+
+def test_get_market_price_matches_snapshot_by_conid(client):
+    """Test single price lookups ignore snapshot entries for other contracts"""
+    client.client.search_contract.return_value = [{"conid": 265598}]
+    client.client.get_market_snapshot.return_value = [{"conid": 1, "31": "10"}]
+
+    client.market_data_timeout = 0
+    assert client.get_market_price("AAPL") is None
+
+
+def test_conid_cache_file_persists_across_clients(tmp_path):
+    """Test resolved contract IDs are reused by later clients until they expire"""
+    cache_file = tmp_path / "cache" / "conids.json"
+
+    first = TradingClient(conid_cache_file=str(cache_file))
+    first.client = Mock()
+    first.client.search_contract.return_value = [{"conid": "265598"}]
+    assert first._resolve_conid("AAPL") == 265598
+
+    second = TradingClient(conid_cache_file=str(cache_file))
+    second.client = Mock()
+    assert second._resolve_conid("AAPL") == 265598
+    second.client.search_contract.assert_not_called()
+
+    with patch("ibkr_toolkit.api.trading_client.time.time", return_value=time.time() + 91 * 86400):
+        expired = TradingClient(conid_cache_file=str(cache_file))
+    assert expired._conids == {}
+
+
+def test_orders_search_again_for_stale_disk_conids(tmp_path):
+    """Test orders do not use a day-old disk conid, while price lookups still may"""
+    cache_file = tmp_path / "conids.json"
+    day_old = time.time() - 86400
+    cache_file.write_text(json.dumps({"AAPL": {"conid": 111, "timestamp": day_old}}))
+    client = TradingClient(conid_cache_file=str(cache_file))
+    client.client = Mock()
+    client.client.get_market_snapshot.return_value = [{"conid": 111, "31": "150"}]
+    client.client.search_contract.return_value = [{"conid": 265598}]
+    client.client.place_order.return_value = [{"order_id": 7}]
+
+    assert client.get_market_price("AAPL") == 150.0
+    client.client.search_contract.assert_not_called()
+
+    results = client.place_trailing_stop_orders_batch(["AAPL"], 10, 5.0, account="U1")
+
+    assert results[0]["orderId"] == 7
+    client.client.search_contract.assert_called_once_with("AAPL")
+    assert client.client.place_order.call_args[0][1][0]["conid"] == 265598
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "not json",
+        "[]",
+        '{"AAPL": 265598}',
+        '{"AAPL": {"conid": 265598, "timestamp": "soon"}}',
+        '{"AAPL": {"timestamp": 9999999999}}',
+    ],
+)
+def test_malformed_conid_cache_file_is_ignored(tmp_path, content):
+    """Test a conid cache file with the wrong shape is ignored instead of raising"""
+    cache_file = tmp_path / "conids.json"
+    cache_file.write_text(content)
+
+    client = TradingClient(conid_cache_file=str(cache_file))
+
+    assert client._conids == {}
+
+
+def test_get_open_orders_across_accounts_keeps_account_order(client):
+    """Test orders fetched concurrently for all accounts are combined in account order"""
+    client.client.get_accounts.return_value = [{"id": "U1"}, {"accountId": "U2"}]
+
+    def get_live_orders(account_id):
+        if account_id == "U1":
+            time.sleep(0.05)
+        return {"orders": [{"orderId": account_id}]}
+
+    client.client.get_live_orders.side_effect = get_live_orders
+
+    assert client.get_open_orders() == [{"orderId": "U1"}, {"orderId": "U2"}]
+
+
+def test_positions_cached_until_order_placed(client):
+    """Test positions are reused per account and refetched after placing an order"""
+    client.client.get_positions.return_value = [{"contractDesc": "AAPL", "position": 10}]
+    client.client.place_order.return_value = [{"order_id": 101}]
+
+    client.get_positions("U123")
+    client.get_positions("U123")
+    assert client.client.get_positions.call_count == 1
+
+    client.place_trailing_stop_order("AAPL", 10, 5.0, account="U123", conid=265598)
+    client.get_positions("U123")
+    assert client.client.get_positions.call_count == 2
+
+
+def test_concurrent_contract_lookups_are_coalesced(client):
+    """Test concurrent conid lookups for one symbol share a single search"""
+    release = threading.Event()
+
+    def search_contract(symbol):
+        release.wait(timeout=5)
+        return [{"conid": 265598}]
+
+    client.client.search_contract.side_effect = search_contract
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(client._resolve_conid, "AAPL") for _ in range(3)]
+        while client.client.search_contract.call_count == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        conids = [f.result() for f in futures]
+
+    assert conids == [265598] * 3
+    assert client.client.search_contract.call_count == 1
+
+
+def test_get_positions_normalizes_missing_numbers(client):
+    """Test null and NaN position fields are reported as zero"""
+    client.client.get_positions.return_value = [
+        {"contractDesc": "AAPL", "position": 10, "mktPrice": None, "mktValue": float("nan")}
+    ]
+
+    position = client.get_positions("U123")[0]
+
+    assert position["position"] == 10.0
+    assert position["mktPrice"] == 0.0
+    assert position["mktValue"] == 0.0
+    assert position["unrealizedPnl"] == 0.0
+
+
+def test_performance_cached_per_accounts_and_period(client):
+    """Test performance data is reused within the endpoint's rate limit window"""
+    client.client.get_performance.return_value = {"nav": {}}
+
+    client.get_performance(["U2", "U1"], "1M")
+    client.get_performance(["U1", "U2"], "1M")
+    assert client.client.get_performance.call_count == 1
+
+    client.get_performance(["U1", "U2"], "YTD")
+    assert client.client.get_performance.call_count == 2
+
+
+def test_cached_performance_is_not_changed_by_callers(client):
+    """Test changing returned performance data does not alter later cached results"""
+    client.client.get_performance.return_value = {"nav": {"data": [{"id": "U1"}]}}
+
+    first = client.get_performance(["U1"], "1M")
+    first["nav"]["data"][0]["id"] = "changed"
+    second = client.get_performance(["U1"], "1M")
+    second["nav"]["data"].clear()
+
+    assert client.get_performance(["U1"], "1M") == {"nav": {"data": [{"id": "U1"}]}}
+    assert client.client.get_performance.call_count == 1
+
+
+def test_async_context_manager_connects_and_disconnects(client):
+    """Test async with connects on entry and releases streams on exit"""
+    client.client.get_auth_status.return_value = {"authenticated": True}
+
+    async def run():
+        async with client as connected:
+            assert connected.is_connected()
+        return client.is_connected()
+
+    assert asyncio.run(run()) is False
+    client.client.get_auth_status.assert_called_once()
+
+
+def test_resolve_conids_writes_cache_file_once_per_batch(tmp_path):
+    """Test resolving several symbols saves the conid cache file once"""
+    cache_file = tmp_path / "conids.json"
+    client = TradingClient(conid_cache_file=str(cache_file))
+    client.client = Mock()
+    client.client.search_contract.side_effect = lambda symbol: [{"conid": len(symbol)}]
+
+    with patch.object(client, "_save_conid_cache", wraps=client._save_conid_cache) as save:
+        assert client._resolve_conids(["A", "BB", "CCC"]) == [1, 2, 3]
+        client._resolve_conids(["A", "BB"])
+
+    save.assert_called_once()
+    assert cache_file.exists()
+
+
+def test_place_trailing_stop_orders_batch_keeps_symbol_order(client):
+    """Test batch orders resolve contracts up front and report failures per symbol"""
+    client.client.search_contract.side_effect = lambda symbol: (
+        [] if symbol == "NOPE" else [{"conid": len(symbol)}]
+    )
+    client.client.place_order.side_effect = lambda account, orders: [
+        {"order_id": orders[0]["conid"] * 10}
+    ]
+
+    results = client.place_trailing_stop_orders_batch(
+        ["AAPL", "NOPE", "MSFTX"], quantity=1, trailing_percent=5.0, action="BUY", account="U1"
+    )
+
+    assert [r["symbol"] for r in results] == ["AAPL", "NOPE", "MSFTX"]
+    assert results[0]["orderId"] == 40
+    assert results[1] == {"symbol": "NOPE", "error": "Contract not found", "status": "failed"}
+    assert results[2]["orderId"] == 50
+    assert client.client.search_contract.call_count == 3
+
+
+def test_cancel_orders_runs_cancellations_concurrently(client):
+    """Test cancellations for several orders overlap instead of running one by one"""
+    client.client.get_accounts.return_value = [{"id": "U1"}]
+    client.client.get_live_orders.return_value = [
+        {"orderId": order_id, "account": "U1"} for order_id in (1, 2, 3)
+    ]
+    barrier = threading.Barrier(3)
+    client.client.cancel_order.side_effect = lambda account, order_id: barrier.wait(timeout=2)
+
+    results = client.cancel_orders([1, 2, 3])
+
+    assert [r["orderId"] for r in results] == [1, 2, 3]
+    assert [r["status"] for r in results] == ["cancelled"] * 3
@@ -0,0 +1,24 @@
+"""
+Tests for Web API CLI commands
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ibkr_toolkit import web_cli
+from ibkr_toolkit.api.web_client import WebAPIError
+
+
+@pytest.mark.parametrize("error", [None, WebAPIError("gateway down")])
+@patch("ibkr_toolkit.web_cli.WebAPIClient")
+def test_commands_close_their_client(mock_client_cls, error):
+    """Test a command stops the keep-alive thread and releases connections when done"""
+    client = mock_client_cls.return_value
+    client.search_contract.side_effect = error
+    client.search_contract.return_value = []
+    config = Mock(web_api_url="https://gw/v1/api", web_api_verify_ssl=False, web_api_timeout=30)
+
+    assert web_cli.search_command(config, "AAPL", "json") == (1 if error else 0)
+
+    client.close.assert_called_once()
@@ -0,0 +1,329 @@
+"""
+Tests for IBKR Client Portal Web API client
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ibkr_toolkit.api.web_client import (
+    NotFoundError,
+    RateLimiter,
+    WebAPIClient,
+    WebAPIError,
+    _build_url,
+    _is_etag_cacheable,
+    _join_csv,
+)
+from ibkr_toolkit.constants import WEB_API_POOL_SIZE
+
+
+def test_session_pools_connections_for_concurrent_requests():
+    """Test the session keeps several keep-alive connections to the gateway"""
+    client = WebAPIClient()
+
+    adapter = client.session.get_adapter("https://localhost:5001/v1/api/tickle")
+    assert adapter._pool_maxsize == WEB_API_POOL_SIZE
+
+
+def test_session_sends_json_content_type():
+    """Test the JSON content type is configured once on the session"""
+    client = WebAPIClient()
+
+    assert client.session.headers["Content-Type"] == "application/json"
+    assert "keep-alive" in client.session.headers["Connection"]
+
+
+@patch("ibkr_toolkit.api.web_client.time.sleep")
+@patch("ibkr_toolkit.api.web_client.time.monotonic")
+def test_rate_limiter_spends_tokens_and_waits_for_refill(mock_monotonic, mock_sleep):
+    """Test a full bucket allows a burst, then waits only for the missing token fraction"""
+    mock_monotonic.side_effect = [0.0, 0.0, 0.0, 0.25, 0.5, 1.0]
+    limiter = RateLimiter(max_requests=2, time_window=1.0)
+
+    limiter.wait_if_needed()
+    limiter.wait_if_needed()
+    mock_sleep.assert_not_called()
+
+    limiter.wait_if_needed()
+    mock_sleep.assert_called_once_with(0.25)
+
+    limiter.wait_if_needed()
+    assert mock_sleep.call_count == 1
+    assert limiter.tokens == 0.0
+
+
+def test_market_snapshot_splits_large_requests():
+    """Test snapshots for many contracts are requested in chunks and combined"""
+    client = WebAPIClient()
+    calls = []
+
+    def request(method, endpoint, params=None):
+        conids = params["conids"].split(",")
+        calls.append((conids, params["fields"]))
+        return [{"conid": int(c)} for c in conids]
+
+    with (
+        patch("ibkr_toolkit.api.web_client.MARKET_DATA_MAX_CONIDS", 2),
+        patch.object(client, "_request", side_effect=request),
+    ):
+        snapshot = client.get_market_snapshot([1, 2, 3])
+
+    assert [item["conid"] for item in snapshot] == [1, 2, 3]
+    assert calls == [(["1", "2"], "31,84,85,86,88"), (["3"], "31,84,85,86,88")]
+
+
+@patch("ibkr_toolkit.api.web_client.time.sleep")
+def test_market_snapshot_waits_until_prices_arrive(mock_sleep):
+    """Test an empty first snapshot is repeated until the last price arrives"""
+    client = WebAPIClient()
+    client._request = Mock(side_effect=[[{"conid": 1}], [{"conid": 1, "31": "5"}]])
+
+    snapshot = client.get_market_snapshot([1], wait=True, poll_interval=0.25)
+
+    assert snapshot == [{"conid": 1, "31": "5"}]
+    assert client._request.call_count == 2
+    mock_sleep.assert_called_once_with(0.25)
+
+
+@patch("ibkr_toolkit.api.web_client.time.sleep")
+@patch("ibkr_toolkit.api.web_client.time.monotonic")
+def test_market_snapshot_wait_gives_up_after_timeout(mock_monotonic, mock_sleep):
+    """Test polling stops once the timeout expires"""
+    client = WebAPIClient()
+    mock_monotonic.side_effect = [0.0, 0.5, 5.0]
+    client._request = Mock(return_value=[{"conid": 1}])
+
+    assert client.get_market_snapshot([1], wait=True, timeout=2.0) == [{"conid": 1}]
+    assert client._request.call_count == 2
+
+
+def test_conditional_get_reuses_body_when_not_modified():
+    """Test GET responses with an ETag are revalidated and reused on 304"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    first = Mock(status_code=200, content=b'[{"id": "U1"}]', headers={"ETag": '"v1"'})
+    first.json.return_value = [{"id": "U1"}]
+    not_modified = Mock(status_code=304, content=b"", headers={})
+    client.session = Mock()
+    client.session.request.side_effect = [first, not_modified]
+
+    accounts = client.get_accounts()
+    assert accounts == [{"id": "U1"}]
+    accounts[0]["alias"] = "changed"
+    assert client.get_accounts() == [{"id": "U1"}]
+
+    assert client.session.request.call_args_list[0].kwargs["headers"] is None
+    assert client.session.request.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_conditional_get_skips_live_endpoints():
+    """Test live data such as orders is never served from the ETag cache"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    response = Mock(status_code=200, content=b"{}", headers={"ETag": '"v1"'})
+    response.json.return_value = {"orders": []}
+    client.session = Mock()
+    client.session.request.return_value = response
+
+    client.get_live_orders("U1")
+    client.get_live_orders("U1")
+
+    assert client._etag_cache == {}
+    assert client.session.request.call_args_list[1].kwargs["headers"] is None
+    assert _is_etag_cacheable("/iserver/contract/265598/info")
+    assert not _is_etag_cacheable("/iserver/marketdata/snapshot")
+
+
+def test_error_response_body_parsed_once():
+    """Test error details come from a single parse, including non-JSON bodies"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    json_error = Mock(status_code=500, text='{"error": "busy"}')
+    json_error.json.return_value = {"error": "busy"}
+    html_error = Mock(status_code=502, text="<html>Bad gateway</html>")
+    html_error.json.side_effect = ValueError("not json")
+    client.session = Mock()
+    client.session.request.side_effect = [json_error, html_error]
+
+    with pytest.raises(WebAPIError, match="busy") as exc_info:
+        client.get_accounts()
+    assert exc_info.value.response == {"error": "busy"}
+    json_error.json.assert_called_once()
+
+    with pytest.raises(WebAPIError, match="Bad gateway") as exc_info:
+        client.get_accounts()
+    assert exc_info.value.status_code == 502
+    assert exc_info.value.response is None
+
+
+def test_auto_tickle_runs_in_background_until_closed():
+    """Test the keep-alive tickle runs off the request path and stops on close"""
+    client = WebAPIClient()
+    client._tickle_interval = 0.01
+    client.session = Mock()
+    client.session.request.return_value = Mock(status_code=200, content=b"", headers={})
+
+    client.get_accounts()
+    deadline = time.monotonic() + 2
+    while client.session.post.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    thread = client._tickle_thread
+    client.close()
+    thread.join(timeout=2)
+
+    assert client.session.post.call_args[0][0].endswith("/tickle")
+    assert client.session.post.call_count >= 2
+    assert not thread.is_alive()
+    client.session.close.assert_called_once()
+
+
+def test_build_url_joins_base_and_endpoint():
+    """Test endpoint paths are joined to the base URL with a single slash"""
+    assert _build_url("https://gw/v1/api", "/tickle") == "https://gw/v1/api/tickle"
+    assert (
+        _build_url("https://gw/v1/api", "iserver/accounts") == "https://gw/v1/api/iserver/accounts"
+    )
+
+
+def test_join_csv_formats_snapshot_parameters():
+    """Test conids and fields are joined into comma-separated query values"""
+    assert _join_csv((265598, 76792991)) == "265598,76792991"
+    assert _join_csv(("31", "84")) == "31,84"
+
+
+def test_request_rejects_unsupported_methods():
+    """Test methods outside GET/POST/DELETE fail without reaching the session"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+
+    with pytest.raises(WebAPIError, match="Unsupported HTTP method"):
+        client._request("PATCH", "/iserver/accounts")
+    client.session.request.assert_not_called()
+
+
+def test_iter_positions_walks_pages_until_short_page():
+    """Test positions are yielded page by page until a partial page is returned"""
+    client = WebAPIClient()
+    full_page = [{"conid": i} for i in range(100)]
+    client.get_positions = Mock(side_effect=[full_page, [{"conid": 100}]])
+
+    positions = list(client.iter_positions("U123"))
+
+    assert len(positions) == 101
+    assert [c.args for c in client.get_positions.call_args_list] == [("U123", 0), ("U123", 1)]
+
+
+def test_request_retries_after_rate_limit():
+    """Test a 429 response is retried after the Retry-After delay"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+    limited = Mock(status_code=429, headers={"Retry-After": "0.5"})
+    ok = Mock(status_code=200, content=b"[]", headers={})
+    ok.json.return_value = []
+    client.session.request.side_effect = [limited, ok]
+
+    with patch("ibkr_toolkit.api.web_client.time.sleep") as mock_sleep:
+        assert client.get_accounts() == []
+
+    mock_sleep.assert_any_call(0.5)
+    assert client.session.request.call_count == 2
+
+
+def test_request_raises_not_found_error_for_404():
+    """Test a 404 surfaces as NotFoundError, which is still a WebAPIError"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+    client.session.request.return_value = Mock(status_code=404, headers={})
+
+    with pytest.raises(NotFoundError) as exc_info:
+        client.get_accounts()
+    assert isinstance(exc_info.value, WebAPIError)
+    assert exc_info.value.status_code == 404
+
+
+def test_concurrent_401s_share_one_reauthentication():
+    """Test requests that see an expired session reauthenticate once and retry"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+    barrier = threading.Barrier(3)
+    reauth_calls = []
+
+    def request(method, url, **kwargs):
+        if url.endswith("/iserver/reauthenticate"):
+            reauth_calls.append(url)
+            return Mock(status_code=200, content=b"", headers={})
+        if url.endswith("/iserver/auth/status"):
+            status = Mock(status_code=200, content=b"{}", headers={})
+            status.json.return_value = {"authenticated": True}
+            return status
+        if client._reauth_generation == 0:
+            barrier.wait(timeout=2)
+            return Mock(status_code=401, headers={}, text="")
+        ok = Mock(status_code=200, content=b"[]", headers={})
+        ok.json.return_value = []
+        return ok
+
+    client.session.request.side_effect = request
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(lambda _: client.get_accounts(), range(3)))
+
+    assert results == [[], [], []]
+    assert len(reauth_calls) == 1
+
+
+@patch("ibkr_toolkit.api.web_client.time.sleep")
+def test_reauthentication_waits_for_authenticated_status(mock_sleep):
+    """Test a GET is retried only after the auth status reports authenticated"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+    statuses = iter([{"authenticated": False}, {"authenticated": True}])
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(url.rsplit("/api", 1)[1])
+        if url.endswith("/iserver/auth/status"):
+            status = Mock(status_code=200, content=b"{}", headers={})
+            status.json.return_value = next(statuses)
+            return status
+        if url.endswith("/iserver/reauthenticate"):
+            return Mock(status_code=200, content=b"", headers={})
+        if client._reauth_generation == 0:
+            return Mock(status_code=401, headers={}, text="")
+        ok = Mock(status_code=200, content=b"[]", headers={})
+        ok.json.return_value = []
+        return ok
+
+    client.session.request.side_effect = request
+
+    assert client.get_accounts() == []
+    assert sent == [
+        "/portfolio/accounts",
+        "/iserver/reauthenticate",
+        "/iserver/auth/status",
+        "/iserver/auth/status",
+        "/portfolio/accounts",
+    ]
+    mock_sleep.assert_called_once()
+
+
+def test_401_on_order_placement_is_not_resent():
+    """Test a POST that fails with 401 raises instead of reauthenticating and re-sending"""
+    client = WebAPIClient()
+    client._tickle_thread = Mock()
+    client.session = Mock()
+    client.session.request.return_value = Mock(status_code=401, headers={}, text="")
+
+    with pytest.raises(WebAPIError) as exc_info:
+        client.place_order("U1", {"conid": 1, "side": "BUY", "quantity": 1})
+
+    assert exc_info.value.status_code == 401
+    client.session.request.assert_called_once()